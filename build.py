@@ -2,14 +2,15 @@ import os
 import subprocess
 import sys
 
-def build_executable():
+def build_executable(clean=False):
     """Build the Xizo executable using PyInstaller"""
     print("Building Xizo Voice Assistant...")
-    
+
     # PyInstaller command for robust version
     cmd = [
         "pyinstaller",
-        "--onefile",  # Single executable
+        "--onedir",  # Folder bundle - avoids onefile's temp-dir extraction on every launch
+        "--noarchive",  # Keep .pyc files on disk instead of inside a zip archive
         "--windowed",  # No console window
         "--name=Xizo",  # Executable name
         "--add-data=README.md;.",  # Include README
@@ -17,28 +18,48 @@ def build_executable():
         "--hidden-import=tkinter.ttk",
         "--hidden-import=pyautogui",
         "--hidden-import=psutil",
+        # Heavy or unused modules - a smaller bundle means a faster launch
+        "--exclude-module=whisper",
+        "--exclude-module=torch",
+        "--exclude-module=scipy",
+        "--exclude-module=matplotlib",
+        "--exclude-module=numpy.tests",
+        "--exclude-module=PIL.ImageQt",
+        "--exclude-module=tkinter.test",
+        "--exclude-module=test",
+        "--exclude-module=unittest",
+        "--exclude-module=pydoc_data",
+        "--exclude-module=lib2to3",
+        "--exclude-module=distutils",
         "xizo_robust.py"
     ]
+
+    if sys.platform != "win32":
+        cmd.insert(-1, "--strip")
     
     try:
-        # Remove existing build files
-        if os.path.exists("dist"):
-            import shutil
-            shutil.rmtree("dist")
-        if os.path.exists("build"):
+        if clean:
+            # Remove existing build files (full cold rebuild)
             import shutil
-            shutil.rmtree("build")
+            if os.path.exists("dist"):
+                shutil.rmtree("dist")
+            if os.path.exists("build"):
+                shutil.rmtree("build")
+            if os.path.exists("Xizo.spec"):
+                os.remove("Xizo.spec")
+
+        # Reuse the existing spec and build/ cache for fast incremental builds
         if os.path.exists("Xizo.spec"):
-            os.remove("Xizo.spec")
-        
+            cmd = ["pyinstaller", "Xizo.spec"]
+
         # Run PyInstaller
         result = subprocess.run(cmd, capture_output=True, text=True)
         
         if result.returncode == 0:
             print("✅ Build successful!")
-            print(f"Executable created: dist/Xizo.exe")
+            print(f"Executable created: dist/Xizo/Xizo.exe")
             print("\nTo run Xizo:")
-            print("1. Navigate to the dist folder")
+            print("1. Navigate to the dist/Xizo folder")
             print("2. Double-click Xizo.exe")
             print("3. Use manual command entry or voice commands if available")
         else:
@@ -50,4 +71,4 @@ def build_executable():
         print(f"❌ Build error: {e}")
 
 if __name__ == "__main__":
-    build_executable() 
\ No newline at end of file
+    build_executable(clean="--clean" in sys.argv)
\ No newline at end of file
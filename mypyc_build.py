@@ -0,0 +1,24 @@
+"""
+Optional ahead-of-time compilation of the command dispatch hot path.
+
+Compiles voice_control/command_processor.py into a C extension with
+mypyc so parsing/dispatch runs natively. The app transparently falls
+back to the pure-Python module when the compiled extension is absent.
+
+Usage:
+    pip install mypy
+    python mypyc_build.py build_ext --inplace
+"""
+
+from setuptools import setup
+
+try:
+    from mypyc.build import mypycify
+except ImportError:
+    raise SystemExit("mypyc not available - install mypy to build the "
+                     "compiled command processor")
+
+setup(
+    name="vocex-compiled",
+    ext_modules=mypycify(["voice_control/command_processor.py"]),
+)
@@ -2,21 +2,66 @@ import subprocess
 import sys
 import os
 
+def get_missing_requirements():
+    """Return requirements from requirements.txt that are not yet installed"""
+    import importlib.metadata
+
+    missing = []
+    with open("requirements.txt") as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+            name, _, wanted = line.partition("==")
+            try:
+                installed = importlib.metadata.version(name.strip())
+            except importlib.metadata.PackageNotFoundError:
+                missing.append(line)
+                continue
+            if wanted and installed != wanted.strip():
+                missing.append(line)
+    return missing
+
 def install_requirements():
     """Install required packages"""
     print("Installing Xizo dependencies...")
-    
+
     try:
-        # Install requirements
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"])
+        # Only hand pip the requirements that aren't already satisfied,
+        # so repeat setups skip the resolver and network entirely
+        missing = get_missing_requirements()
+        if not missing:
+            print("All dependencies already installed!")
+            return True
+
+        cmd = [sys.executable, "-m", "pip", "install"]
+        if os.path.isdir("wheelhouse"):
+            # Local wheel cache (pip download -d wheelhouse -r requirements.txt)
+            cmd += ["--no-index", "--find-links=wheelhouse"]
+        subprocess.check_call(cmd + missing)
         print("Dependencies installed successfully!")
-        
+
     except subprocess.CalledProcessError as e:
         print(f"Failed to install dependencies: {e}")
         return False
-    
+
     return True
 
+def build_extensions():
+    """Optionally AOT-compile the command dispatch hot path with mypyc"""
+    try:
+        import mypyc  # noqa: F401
+    except ImportError:
+        print("mypy not installed - skipping compiled command processor")
+        return
+
+    try:
+        subprocess.check_call([sys.executable, "mypyc_build.py",
+                               "build_ext", "--inplace"])
+        print("Compiled command processor built")
+    except subprocess.CalledProcessError as e:
+        print(f"mypyc build failed (falling back to pure Python): {e}")
+
 def check_pyaudio():
     """Check if PyAudio is properly installed"""
     try:
@@ -36,7 +81,10 @@ def main():
     # Install requirements
     if not install_requirements():
         return
-    
+
+    # Build optional compiled extensions
+    build_extensions()
+
     # Check PyAudio
     if not check_pyaudio():
         print("\nPyAudio installation may require additional steps on Windows.")
@@ -5,116 +5,302 @@ Handles command parsing, execution, and management
 
 import subprocess
 import os
+import itertools
+import re
+import shutil
 import sys
 import json
+import time
 import logging
+import types
+import webbrowser
+from collections import deque
+from urllib.parse import quote_plus
 from typing import Dict, List, Callable, Any, Optional
 from datetime import datetime
-import psutil
+import importlib.util
 
-# Try to import PyAutoGUI
+# Heavy dependencies are imported lazily on first use so they stay off
+# the startup path; find_spec detects availability without loading them
+AUTOGUI_AVAILABLE = importlib.util.find_spec("pyautogui") is not None
+
+# Spawn children detached and without a console so launches skip
+# console-handle inheritance (and the visible flash) on Windows
+CREATE_NO_WINDOW = 0x08000000
+DETACHED_PROCESS = 0x00000008
+if sys.platform == "win32":
+    _POPEN_KW = dict(close_fds=True,
+                     creationflags=CREATE_NO_WINDOW | DETACHED_PROCESS)
+else:
+    _POPEN_KW = dict(close_fds=True, start_new_session=True)
+
+# Text injection: on Windows one SendInput call types a whole string
+# (two KEYEVENTF_UNICODE events per UTF-16 unit), instead of pyautogui's
+# keystroke-at-a-time loop with inter-key sleeps
+if sys.platform == "win32":
+    import ctypes
+    import struct
+
+    _INPUT_KEYBOARD = 1
+    _KEYEVENTF_UNICODE = 0x0004
+    _KEYEVENTF_KEYUP = 0x0002
+
+    class _KEYBDINPUT(ctypes.Structure):
+        _fields_ = [("wVk", ctypes.c_ushort),
+                    ("wScan", ctypes.c_ushort),
+                    ("dwFlags", ctypes.c_ulong),
+                    ("time", ctypes.c_ulong),
+                    ("dwExtraInfo", ctypes.c_void_p)]
+
+    class _INPUT(ctypes.Structure):
+        class _U(ctypes.Union):
+            _fields_ = [("ki", _KEYBDINPUT),
+                        ("padding", ctypes.c_ubyte * 32)]
+        _anonymous_ = ("u",)
+        _fields_ = [("type", ctypes.c_ulong), ("u", _U)]
+
+    def _send_unicode_batch(text: str) -> bool:
+        """Type a whole string with a single SendInput syscall"""
+        # utf-16-le units handle characters outside the BMP correctly
+        encoded = text.encode("utf-16-le")
+        units = struct.unpack(f"<{len(encoded) // 2}H", encoded)
+        inputs = (_INPUT * (2 * len(units)))()
+        for i, unit in enumerate(units):
+            for j, flags in ((2 * i, _KEYEVENTF_UNICODE),
+                             (2 * i + 1, _KEYEVENTF_UNICODE | _KEYEVENTF_KEYUP)):
+                inputs[j].type = _INPUT_KEYBOARD
+                inputs[j].ki.wScan = unit
+                inputs[j].ki.dwFlags = flags
+        sent = ctypes.windll.user32.SendInput(len(inputs), inputs,
+                                              ctypes.sizeof(_INPUT))
+        return sent == len(inputs)
+else:
+    def _send_unicode_batch(text: str) -> bool:
+        """No SendInput off Windows - callers fall back to pyautogui"""
+        return False
+
+# Try to import pyahocorasick for O(len(text)) keyword matching
 try:
-    import pyautogui
-    AUTOGUI_AVAILABLE = True
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
 except ImportError:
-    AUTOGUI_AVAILABLE = False
+    AHOCORASICK_AVAILABLE = False
+
+_pyautogui = None
+_psutil = None
+_ts_cache = (0, "")
+
+def _iso_now():
+    """ISO timestamp cached at one-second granularity"""
+    global _ts_cache
+    now = int(time.time())
+    if now != _ts_cache[0]:
+        _ts_cache = (now, datetime.fromtimestamp(now).isoformat())
+    return _ts_cache[1]
+
+def _get_pyautogui():
+    """Import pyautogui on first use and cache the module"""
+    global _pyautogui
+    if _pyautogui is None:
+        import pyautogui
+        _pyautogui = pyautogui
+    return _pyautogui
+
+def _get_psutil():
+    """Import psutil on first use and cache the module"""
+    global _psutil
+    if _psutil is None:
+        import psutil
+        _psutil = psutil
+    return _psutil
+
+# Default dispatch tables, frozen and shared across instances.
+# Commands map keyword -> handler method name, bound per instance.
+_DEFAULT_COMMANDS = types.MappingProxyType({
+    "open": "open_program",
+    "launch": "open_program",
+    "start": "open_program",
+    "run": "open_program",
+    "write": "write_text",
+    "type": "write_text",
+    "search": "search_web",
+    "google": "search_web",
+    "find": "search_web",
+    "lookup": "search_web",
+    "close": "close_program",
+    "exit": "close_program",
+    "quit": "close_program",
+    "kill": "close_program",
+    "copy": "copy_to_clipboard",
+    "paste": "paste_from_clipboard",
+    "screenshot": "take_screenshot",
+    "volume": "control_volume",
+    "brightness": "control_brightness",
+    "mute": "toggle_mute",
+    "file": "file_operations",
+    "folder": "file_operations",
+    "directory": "file_operations",
+    "time": "get_time",
+    "date": "get_date",
+    "weather": "get_weather",
+    "reminder": "set_reminder",
+    "note": "create_note",
+    "email": "send_email",
+    "message": "send_message"
+})
+
+_DEFAULT_PROGRAMS = types.MappingProxyType({
+    # Windows built-in
+    "notepad": "notepad.exe",
+    "word": "winword.exe",
+    "excel": "excel.exe",
+    "powerpoint": "powerpnt.exe",
+    "chrome": "chrome.exe",
+    "firefox": "firefox.exe",
+    "edge": "msedge.exe",
+    "calculator": "calc.exe",
+    "paint": "mspaint.exe",
+    "explorer": "explorer.exe",
+    "control panel": "control.exe",
+    "task manager": "taskmgr.exe",
+    "cmd": "cmd.exe",
+    "powershell": "powershell.exe",
+    "regedit": "regedit.exe",
+    "services": "services.msc",
+    "device manager": "devmgmt.msc",
+
+    # Common applications
+    "spotify": "spotify.exe",
+    "discord": "discord.exe",
+    "steam": "steam.exe",
+    "vscode": "code.exe",
+    "sublime": "sublime_text.exe",
+    "photoshop": "photoshop.exe",
+    "illustrator": "illustrator.exe",
+    "premiere": "premiere.exe",
+    "after effects": "afterfx.exe",
+    "blender": "blender.exe",
+    "unity": "unity.exe",
+    "unreal": "unreal.exe",
+    "zoom": "zoom.exe",
+    "teams": "teams.exe",
+    "skype": "skype.exe",
+    "whatsapp": "whatsapp.exe",
+    "telegram": "telegram.exe",
+    "slack": "slack.exe",
+    "notion": "notion.exe",
+    "obsidian": "obsidian.exe",
+    "roam": "roam.exe",
+    "logseq": "logseq.exe"
+})
+
+def _on_word_boundary(text, start, end):
+    """True when text[start:end] is not embedded inside a larger word
+
+    Keeps automaton hits consistent with the \\b-anchored regex fallback,
+    so optional pyahocorasick never changes dispatch semantics.
+    """
+    return ((start == 0 or not text[start - 1].isalnum())
+            and (end == len(text) or not text[end].isalnum()))
+
 
 class CommandProcessor:
     """Advanced command processor with natural language understanding"""
-    
+
+    __slots__ = ('commands', 'programs', 'aliases', 'command_history',
+                 'max_history', '_cmd_re', '_cmd_aho', '_prog_re',
+                 '_prog_aho', '_proc_index', '_known_pids')
+
     def __init__(self):
         self.commands = {}
         self.programs = {}
         self.aliases = {}
-        self.command_history = []
         self.max_history = 100
-        
+        self.command_history = deque(maxlen=self.max_history)
+        self._proc_index = {}
+        self._known_pids = set()
+
         # Load default commands and programs
         self._load_default_commands()
         self._load_default_programs()
-        
+
+        # Precompile the keyword matchers so parsing is one scan each
+        self._rebuild_command_regex()
+        self._rebuild_program_matcher()
+
+    def _rebuild_command_regex(self):
+        """Compile all command keywords (and aliases) into one matcher"""
+        keywords = sorted(set(self.commands) | set(self.aliases), key=len, reverse=True)
+        self._cmd_re = re.compile(r'\b(' + '|'.join(re.escape(k) for k in keywords) + r')\b')
+
+        # With pyahocorasick installed, build a DFA over all keywords so
+        # matching stays O(len(text)) as the command table grows
+        self._cmd_aho = None
+        if AHOCORASICK_AVAILABLE:
+            automaton = ahocorasick.Automaton()
+            for keyword in keywords:
+                automaton.add_word(keyword, (len(keyword), keyword))
+            automaton.make_automaton()
+            self._cmd_aho = automaton
+
+    def _match_command(self, text: str):
+        """Find the best command keyword in text; returns (keyword, start, end)"""
+        if self._cmd_aho is not None:
+            best = None
+            for end, (length, keyword) in self._cmd_aho.iter(text):
+                start = end - length + 1
+                if not _on_word_boundary(text, start, end + 1):
+                    continue
+                # Earliest match wins; on overlap the longest keyword wins
+                if best is None or start < best[1] or (start == best[1] and length > len(best[0])):
+                    best = (keyword, start, end + 1)
+            return best
+
+        match = self._cmd_re.search(text)
+        if match:
+            return (match.group(1), match.start(), match.end())
+        return None
+
+    def _rebuild_program_matcher(self):
+        """Compile the known program names into a single matcher"""
+        names = sorted(self.programs, key=len, reverse=True)
+        self._prog_re = re.compile(r'\b(' + '|'.join(re.escape(n) for n in names) + r')\b')
+
+        self._prog_aho = None
+        if AHOCORASICK_AVAILABLE:
+            automaton = ahocorasick.Automaton()
+            for name in names:
+                automaton.add_word(name, (len(name), name))
+            automaton.make_automaton()
+            self._prog_aho = automaton
+
+    def _match_program(self, text: str) -> Optional[str]:
+        """Find a known program name mentioned anywhere in text"""
+        if self._prog_aho is not None:
+            best = None
+            for end, (length, name) in self._prog_aho.iter(text):
+                start = end - length + 1
+                if not _on_word_boundary(text, start, end + 1):
+                    continue
+                if best is None or start < best[1] or (start == best[1] and length > len(best[0])):
+                    best = (name, start)
+            return best[0] if best else None
+
+        match = self._prog_re.search(text)
+        return match.group(1) if match else None
+
     def _load_default_commands(self):
-        """Load default command handlers"""
-        self.commands = {
-            "open": self.open_program,
-            "launch": self.open_program,
-            "start": self.open_program,
-            "run": self.open_program,
-            "write": self.write_text,
-            "type": self.write_text,
-            "search": self.search_web,
-            "google": self.search_web,
-            "find": self.search_web,
-            "lookup": self.search_web,
-            "close": self.close_program,
-            "exit": self.close_program,
-            "quit": self.close_program,
-            "kill": self.close_program,
-            "copy": self.copy_to_clipboard,
-            "paste": self.paste_from_clipboard,
-            "screenshot": self.take_screenshot,
-            "volume": self.control_volume,
-            "brightness": self.control_brightness,
-            "mute": self.toggle_mute,
-            "file": self.file_operations,
-            "folder": self.file_operations,
-            "directory": self.file_operations,
-            "time": self.get_time,
-            "date": self.get_date,
-            "weather": self.get_weather,
-            "reminder": self.set_reminder,
-            "note": self.create_note,
-            "email": self.send_email,
-            "message": self.send_message
-        }
-    
+        """Load default command handlers from the shared frozen table"""
+        self.commands = {kw: getattr(self, attr)
+                         for kw, attr in _DEFAULT_COMMANDS.items()}
+
     def _load_default_programs(self):
-        """Load default program mappings"""
-        self.programs = {
-            # Windows built-in
-            "notepad": "notepad.exe",
-            "word": "winword.exe",
-            "excel": "excel.exe",
-            "powerpoint": "powerpnt.exe",
-            "chrome": "chrome.exe",
-            "firefox": "firefox.exe",
-            "edge": "msedge.exe",
-            "calculator": "calc.exe",
-            "paint": "mspaint.exe",
-            "explorer": "explorer.exe",
-            "control panel": "control.exe",
-            "task manager": "taskmgr.exe",
-            "cmd": "cmd.exe",
-            "powershell": "powershell.exe",
-            "regedit": "regedit.exe",
-            "services": "services.msc",
-            "device manager": "devmgmt.msc",
-            
-            # Common applications
-            "spotify": "spotify.exe",
-            "discord": "discord.exe",
-            "steam": "steam.exe",
-            "vscode": "code.exe",
-            "sublime": "sublime_text.exe",
-            "photoshop": "photoshop.exe",
-            "illustrator": "illustrator.exe",
-            "premiere": "premiere.exe",
-            "after effects": "afterfx.exe",
-            "blender": "blender.exe",
-            "unity": "unity.exe",
-            "unreal": "unreal.exe",
-            "zoom": "zoom.exe",
-            "teams": "teams.exe",
-            "skype": "skype.exe",
-            "whatsapp": "whatsapp.exe",
-            "telegram": "telegram.exe",
-            "slack": "slack.exe",
-            "notion": "notion.exe",
-            "obsidian": "obsidian.exe",
-            "roam": "roam.exe",
-            "logseq": "logseq.exe"
-        }
-    
+        """Load default program mappings from the shared frozen table"""
+        # Resolve logical names to absolute paths once so launches
+        # skip the per-call PATH walk (unresolved names kept as-is)
+        self.programs = {name: (shutil.which(exe) or exe)
+                         for name, exe in _DEFAULT_PROGRAMS.items()}
+
     def process_command(self, text: str) -> Dict[str, Any]:
         """Process a voice command and return result"""
         try:
@@ -132,7 +318,7 @@ class CommandProcessor:
                 "command": text,
                 "parsed": parsed,
                 "result": result,
-                "timestamp": datetime.now().isoformat()
+                "timestamp": _iso_now()
             }
             
         except Exception as e:
@@ -141,23 +327,22 @@ class CommandProcessor:
                 "success": False,
                 "command": text,
                 "error": str(e),
-                "timestamp": datetime.now().isoformat()
+                "timestamp": _iso_now()
             }
     
     def _parse_command(self, text: str) -> Dict[str, Any]:
         """Parse natural language command into structured format"""
         text = text.lower().strip()
-        
-        # Find the main command
+
+        # Find the main command with a single scan over the text
         command = None
         args = text
-        
-        for cmd in self.commands.keys():
-            if cmd in text:
-                command = cmd
-                args = text.replace(cmd, "").strip()
-                break
-        
+
+        match = self._match_command(text)
+        if match:
+            command, start, end = match
+            args = (text[:start] + text[end:]).strip()
+
         # Handle aliases
         if command in self.aliases:
             command = self.aliases[command]
@@ -183,19 +368,25 @@ class CommandProcessor:
     def open_program(self, program_name: str) -> str:
         """Open a program or file"""
         program_name = program_name.strip()
-        
+
+        # Resolve a known program mentioned anywhere in the spoken args
+        if program_name not in self.programs:
+            matched = self._match_program(program_name)
+            if matched:
+                program_name = matched
+
         # Check if it's a known program
         if program_name in self.programs:
             program_path = self.programs[program_name]
             try:
-                subprocess.Popen(program_path)
+                subprocess.Popen(program_path, **_POPEN_KW)
                 return f"Opened {program_name}"
             except Exception as e:
                 raise Exception(f"Failed to open {program_name}: {e}")
         else:
             # Try to open as a file or program
             try:
-                subprocess.Popen(program_name)
+                subprocess.Popen(program_name, **_POPEN_KW)
                 return f"Opened {program_name}"
             except Exception as e:
                 raise Exception(f"Failed to open {program_name}: {e}")
@@ -204,12 +395,19 @@ class CommandProcessor:
         """Write text to active application"""
         if not text.strip():
             return "No text to write"
-            
+
+        try:
+            # One syscall for the whole string on Windows
+            if _send_unicode_batch(text):
+                return f"Wrote text: {text}"
+        except Exception as e:
+            logging.warning(f"SendInput failed, falling back: {e}")
+
         if not AUTOGUI_AVAILABLE:
             return "PyAutoGUI not available for text input"
-            
+
         try:
-            pyautogui.write(text)
+            _get_pyautogui().write(text)
             return f"Wrote text: {text}"
         except Exception as e:
             raise Exception(f"Failed to write text: {e}")
@@ -220,31 +418,96 @@ class CommandProcessor:
             return "No search query provided"
             
         try:
-            search_url = f"https://www.google.com/search?q={query.replace(' ', '+')}"
-            subprocess.Popen(["start", search_url], shell=True)
+            search_url = f"https://www.google.com/search?q={quote_plus(query)}"
+            webbrowser.open(search_url, new=2)
             return f"Searched for: {query}"
         except Exception as e:
             raise Exception(f"Failed to search: {e}")
     
-    def close_program(self, program_name: str) -> str:
-        """Close a program"""
-        program_name = program_name.strip()
-        
+    def _get_proc_index(self) -> Dict[str, list]:
+        """Get a name->processes index, updated incrementally via pid diffs"""
+        psutil = _get_psutil()
+
+        # psutil.pids() is much cheaper than process_iter with attrs, so
+        # only new pids pay the per-process name lookup
+        current = set(psutil.pids())
+        new_pids = current - self._known_pids
+        gone_pids = self._known_pids - current
+
+        for pid in new_pids:
+            try:
+                proc = psutil.Process(pid)
+                self._proc_index.setdefault(proc.name().lower(), []).append(proc)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+
+        if gone_pids:
+            for name in list(self._proc_index):
+                procs = [p for p in self._proc_index[name] if p.pid not in gone_pids]
+                if procs:
+                    self._proc_index[name] = procs
+                else:
+                    del self._proc_index[name]
+
+        self._known_pids = current
+        return self._proc_index
+
+    def _find_matches(self, targets) -> Dict[str, list]:
+        """Resolve spoken names to running processes in one index pass"""
+        # Resolve each spoken name to an executable name up front, then
+        # classify every indexed process in a single sweep
+        resolved = {}
+        for name in targets:
+            key = name if name in self.programs else (self._match_program(name) or name)
+            # programs values are which()-resolved launch paths; the
+            # process index is keyed by bare executable names
+            resolved[name] = os.path.basename(self.programs.get(key, key)).lower()
+        matches = {name: [] for name in targets}
+        for proc_name, procs in self._get_proc_index().items():
+            for name, target in resolved.items():
+                if target in proc_name:
+                    matches[name].extend(procs)
+        return matches
+
+    def close_programs(self, program_names: list) -> str:
+        """Close several programs with a single process-table pass"""
+        targets = [n.strip() for n in program_names if n.strip()]
+        if not targets:
+            return "No programs to close"
+
         try:
-            if program_name in self.programs:
-                program_path = self.programs[program_name]
-                # Kill process by name
-                for proc in psutil.process_iter(['pid', 'name']):
-                    if proc.info['name'] and program_path.lower() in proc.info['name'].lower():
+            closed, missing = [], []
+            for name, procs in self._find_matches(targets).items():
+                if procs:
+                    for proc in procs:
                         proc.terminate()
-                        return f"Closed {program_name}"
-            else:
-                # Try to close by name
-                for proc in psutil.process_iter(['pid', 'name']):
-                    if proc.info['name'] and program_name.lower() in proc.info['name'].lower():
-                        proc.terminate()
-                        return f"Closed {program_name}"
-                        
+                    closed.append(name)
+                else:
+                    missing.append(name)
+
+            parts = []
+            if closed:
+                parts.append(f"Closed {', '.join(closed)}")
+            if missing:
+                parts.append(f"could not find {', '.join(missing)}")
+            return "; ".join(parts)
+        except Exception as e:
+            raise Exception(f"Failed to close programs: {e}")
+
+    def close_program(self, program_name: str) -> str:
+        """Close a program (or several: "chrome and firefox" works)"""
+        names = [n.strip() for n in re.split(r',|\band\b', program_name)
+                 if n.strip()]
+        if len(names) > 1:
+            return self.close_programs(names)
+        program_name = names[0] if names else program_name.strip()
+
+        try:
+            procs = self._find_matches([program_name]).get(program_name, [])
+            if procs:
+                for proc in procs:
+                    proc.terminate()
+                return f"Closed {program_name}"
             return f"Could not find {program_name} to close"
         except Exception as e:
             raise Exception(f"Failed to close {program_name}: {e}")
@@ -255,7 +518,7 @@ class CommandProcessor:
             return "PyAutoGUI not available for clipboard operations"
             
         try:
-            pyautogui.hotkey('ctrl', 'c')
+            _get_pyautogui().hotkey('ctrl', 'c')
             return f"Copied to clipboard: {text}"
         except Exception as e:
             raise Exception(f"Failed to copy to clipboard: {e}")
@@ -266,7 +529,7 @@ class CommandProcessor:
             return "PyAutoGUI not available for clipboard operations"
             
         try:
-            pyautogui.hotkey('ctrl', 'v')
+            _get_pyautogui().hotkey('ctrl', 'v')
             return "Pasted from clipboard"
         except Exception as e:
             raise Exception(f"Failed to paste from clipboard: {e}")
@@ -277,7 +540,7 @@ class CommandProcessor:
             return "PyAutoGUI not available for screenshots"
             
         try:
-            screenshot = pyautogui.screenshot()
+            screenshot = _get_pyautogui().screenshot()
             filename = f"screenshot_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
             screenshot.save(filename)
             return f"Screenshot saved as {filename}"
@@ -367,32 +630,35 @@ class CommandProcessor:
     def add_command(self, name: str, handler: Callable):
         """Add a custom command"""
         self.commands[name.lower()] = handler
+        self._rebuild_command_regex()
         logging.info(f"Added custom command: {name}")
     
     def add_program(self, name: str, path: str):
         """Add a custom program mapping"""
         self.programs[name.lower()] = path
+        self._rebuild_program_matcher()
         logging.info(f"Added program mapping: {name} -> {path}")
     
     def add_alias(self, alias: str, command: str):
         """Add a command alias"""
         self.aliases[alias.lower()] = command.lower()
+        self._rebuild_command_regex()
         logging.info(f"Added alias: {alias} -> {command}")
     
     def _add_to_history(self, command: str):
         """Add command to history"""
-        self.command_history.append({
-            "command": command,
-            "timestamp": datetime.now().isoformat()
-        })
-        
-        # Keep only recent history
-        if len(self.command_history) > self.max_history:
-            self.command_history = self.command_history[-self.max_history:]
-    
+        # deque(maxlen=...) drops the oldest entry in O(1); entries are
+        # compact (command, epoch) tuples and formatted only on read
+        self.command_history.append((command, time.time()))
+
     def get_history(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get command history"""
-        return self.command_history[-limit:] if limit else self.command_history
+        # Slice the deque in place rather than copying it first
+        start = max(0, len(self.command_history) - limit) if limit else 0
+        return [{"command": command,
+                 "timestamp": datetime.fromtimestamp(ts).isoformat()}
+                for command, ts in itertools.islice(self.command_history,
+                                                    start, None)]
     
     def clear_history(self):
         """Clear command history"""
@@ -3,8 +3,10 @@ Speech Engine Module
 Handles speech recognition with multiple fallback options
 """
 
+import re
 import threading
 import time
+import queue
 from typing import Optional, Callable, Dict, Any
 import logging
 
@@ -25,36 +27,99 @@ try:
 except ImportError as e:
     logging.warning(f"Speech recognition not available: {e}")
 
-# Try to import alternative speech recognition
-try:
-    import whisper
-    WHISPER_AVAILABLE = True
-except ImportError:
-    pass
+# Detect alternative speech recognition without importing it; whisper
+# pulls in the whole torch import graph, so the actual import is
+# deferred to _init_speech_recognition. Prefer the CTranslate2 port,
+# which runs int8-quantized and several times faster on CPU.
+import importlib.util
+FASTER_WHISPER_AVAILABLE = importlib.util.find_spec("faster_whisper") is not None
+WHISPER_AVAILABLE = (FASTER_WHISPER_AVAILABLE
+                     or importlib.util.find_spec("whisper") is not None)
+
+# Local streaming recognition: no network round-trip per utterance and
+# partial results arrive while the user is still talking
+VOSK_AVAILABLE = (importlib.util.find_spec("vosk") is not None
+                  and importlib.util.find_spec("pyaudio") is not None)
+
+# Tiny keyword spotter that gates the expensive ASR call: chunks with
+# no wake word in them never reach the recognizer
+KWS_AVAILABLE = importlib.util.find_spec("pvporcupine") is not None
 
 class SpeechEngine:
     """Advanced speech recognition engine with multiple backends"""
     
-    def __init__(self, wake_words: list = None, callback: Callable = None):
+    def __init__(self, wake_words: list = None, callback: Callable = None,
+                 prefer_offline: bool = True):
         self.wake_words = wake_words or ["xizo", "hey xizo", "listen xizo"]
         self.callback = callback
         self.is_listening = False
         self.is_running = True
         self.recognizer = None
         self.microphone = None
+        # Stream into a local Vosk model when installed; flip the flag
+        # to keep the cloud recognize_google path as primary
+        self.use_vosk = VOSK_AVAILABLE and prefer_offline
+        self._mic_source = None
+        self._mic_lock = threading.Lock()
         self.backend = "google"  # google, whisper, offline
-        
+        self._audio_queue = queue.Queue(maxsize=2)
+        self._rebuild_wake_regex()
+
         # Initialize available backends
         self._init_speech_recognition()
         
+    def _rebuild_wake_regex(self):
+        """Compile the wake words into a single case-insensitive pattern"""
+        pattern = '|'.join(re.escape(w) for w in
+                           sorted(self.wake_words, key=len, reverse=True))
+        self._wake_re = re.compile(r'\b(?:' + pattern + r')\b', re.IGNORECASE)
+        # O(1) membership for callers that check words rather than text
+        self.wake_words_set = frozenset(w.lower() for w in self.wake_words)
+
+    def set_wake_words(self, wake_words: list):
+        """Replace the wake-word list and rebuild the matcher once"""
+        self.wake_words = [w.lower() for w in wake_words if w.strip()]
+        self._rebuild_wake_regex()
+        logging.info(f"Wake words set: {self.wake_words}")
+
     def _init_speech_recognition(self):
         """Initialize speech recognition backends"""
         global SPEECH_AVAILABLE, WHISPER_AVAILABLE
-        
+
+        self._kws = None
+        if KWS_AVAILABLE:
+            try:
+                import pvporcupine
+                # Needs a trained "xizo" keyword file shipped next to the app
+                self._kws = pvporcupine.create(keyword_paths=["xizo.ppn"])
+                logging.info("Porcupine wake-word gate initialized")
+            except Exception as e:
+                logging.warning(f"Wake-word gate unavailable: {e}")
+                self._kws = None
+
+        if self.use_vosk:
+            try:
+                import vosk
+                import pyaudio
+                vosk.SetLogLevel(-1)
+                self._vosk_model = vosk.Model(lang="en-us")
+                self._vosk_rec = vosk.KaldiRecognizer(self._vosk_model, 16000)
+                self._pyaudio = pyaudio.PyAudio()
+                logging.info("Vosk streaming recognition initialized")
+            except Exception as e:
+                logging.error(f"Failed to initialize Vosk: {e}")
+                self.use_vosk = False
+
         if SPEECH_AVAILABLE:
             try:
                 self.recognizer = sr.Recognizer()
-                self.microphone = sr.Microphone()
+                # 16 kHz with 20 ms (320-sample) buffers: latency is
+                # bounded by chunk size and ASR resamples to 16 kHz
+                self.microphone = sr.Microphone(sample_rate=16000,
+                                                chunk_size=320)
+                # Hold the stream open for the engine's lifetime so each
+                # utterance skips the PortAudio open/close round-trip
+                self._mic_source = self.microphone.__enter__()
                 self._adjust_for_ambient_noise()
                 logging.info("Google Speech Recognition initialized")
             except Exception as e:
@@ -63,21 +128,42 @@ class SpeechEngine:
                 
         if WHISPER_AVAILABLE:
             try:
-                self.whisper_model = whisper.load_model("base")
+                if FASTER_WHISPER_AVAILABLE:
+                    from faster_whisper import WhisperModel
+                    self.whisper_model = WhisperModel("base", device="auto",
+                                                      compute_type="int8")
+                else:
+                    import whisper
+                    self.whisper_model = whisper.load_model("base")
                 logging.info("Whisper model loaded")
+                # Warm up off the init path so the first utterance is steady-state
+                threading.Thread(target=self._warmup_whisper, daemon=True).start()
             except Exception as e:
                 logging.error(f"Failed to load Whisper model: {e}")
                 WHISPER_AVAILABLE = False
     
+    def _warmup_whisper(self):
+        """Run one silent inference so the first real utterance isn't cold"""
+        try:
+            import numpy as np
+            silence = np.zeros(16000, dtype=np.float32)
+            if FASTER_WHISPER_AVAILABLE:
+                segments, _ = self.whisper_model.transcribe(silence, beam_size=1)
+                list(segments)  # transcription is lazy; force it
+            else:
+                self.whisper_model.transcribe(silence, fp16=False, language='en')
+            logging.info("Whisper model warmed up")
+        except Exception as e:
+            logging.error(f"Whisper warmup failed: {e}")
+
     def _adjust_for_ambient_noise(self):
         """Adjust recognizer for ambient noise"""
-        if not self.recognizer or not self.microphone:
+        if not self.recognizer or not self._mic_source:
             return
-            
+
         try:
             logging.info("Adjusting for ambient noise... Please be quiet.")
-            with self.microphone as source:
-                self.recognizer.adjust_for_ambient_noise(source, duration=1)
+            self.recognizer.adjust_for_ambient_noise(self._mic_source, duration=1)
             logging.info("Ambient noise adjustment complete.")
         except Exception as e:
             logging.error(f"Ambient noise adjustment failed: {e}")
@@ -89,8 +175,15 @@ class SpeechEngine:
             return False
             
         self.is_listening = True
-        self.listen_thread = threading.Thread(target=self._listen_loop, daemon=True)
-        self.listen_thread.start()
+        if self.use_vosk:
+            # Vosk consumes raw frames itself; no capture/recognize split
+            self.capture_thread = threading.Thread(target=self._vosk_loop, daemon=True)
+            self.capture_thread.start()
+        else:
+            self.capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
+            self.capture_thread.start()
+            self.recognize_thread = threading.Thread(target=self._recognize_loop, daemon=True)
+            self.recognize_thread.start()
         logging.info("Started listening for voice commands")
         return True
     
@@ -101,33 +194,108 @@ class SpeechEngine:
     
     def _has_working_backend(self) -> bool:
         """Check if any speech recognition backend is available"""
-        return SPEECH_AVAILABLE or WHISPER_AVAILABLE
+        return self.use_vosk or SPEECH_AVAILABLE or WHISPER_AVAILABLE
+
+    def _vosk_loop(self):
+        """Stream 20 ms microphone frames straight into the local recognizer"""
+        import json
+        import pyaudio
+
+        stream = None
+        try:
+            # 320 frames @ 16 kHz = 20 ms per buffer, so results land
+            # within tens of milliseconds of the end of speech
+            stream = self._pyaudio.open(format=pyaudio.paInt16, channels=1,
+                                        rate=16000, input=True,
+                                        frames_per_buffer=320)
+            while self.is_listening and self.is_running:
+                buf = stream.read(320, exception_on_overflow=False)
+                if self._vosk_rec.AcceptWaveform(buf):
+                    text = json.loads(self._vosk_rec.Result()).get("text", "")
+                    if text:
+                        logging.info(f"Vosk recognized: {text}")
+                        self._process_speech(text.lower())
+        except Exception as e:
+            logging.error(f"Vosk streaming error: {e}")
+        finally:
+            if stream is not None:
+                stream.stop_stream()
+                stream.close()
     
-    def _listen_loop(self):
-        """Main listening loop"""
+    def _capture_loop(self):
+        """Capture stage: record audio chunks and queue them for recognition"""
         while self.is_listening and self.is_running:
             try:
-                text = self._listen_for_speech()
+                audio = self._capture_audio()
+                if audio is None:
+                    continue
+                try:
+                    self._audio_queue.put(audio, timeout=1)
+                except queue.Full:
+                    # Recognition stage is backed up - drop this chunk
+                    logging.warning("Audio queue full, dropping chunk")
+            except Exception as e:
+                logging.error(f"Listening error: {e}")
+                time.sleep(0.1)
+
+    def _recognize_loop(self):
+        """Recognition stage: transcribe queued audio while capture continues"""
+        while self.is_running:
+            try:
+                audio = self._audio_queue.get(timeout=1)
+            except queue.Empty:
+                continue
+            if self._kws is not None and not self._kws_hit(audio):
+                continue  # no wake word in the chunk - skip the ASR call
+            try:
+                text = self._recognize_audio(audio)
                 if text:
                     self._process_speech(text)
             except Exception as e:
-                logging.error(f"Listening error: {e}")
+                logging.error(f"Recognition error: {e}")
+
+    def _capture_audio(self):
+        """Record one audio chunk from the persistent microphone stream"""
+        if SPEECH_AVAILABLE and self.recognizer and self._mic_source:
+            try:
+                with self._mic_lock:
+                    return self.recognizer.listen(self._mic_source, timeout=1,
+                                                  phrase_time_limit=5)
+            except sr.WaitTimeoutError:
+                pass  # No speech started within timeout
+            except Exception as e:
+                logging.error(f"Audio capture error: {e}")
                 time.sleep(0.1)
-    
-    def _listen_for_speech(self) -> Optional[str]:
-        """Listen for speech and return recognized text"""
-        if SPEECH_AVAILABLE and self.recognizer and self.microphone:
-            return self._listen_google()
+        return None
+
+    def _kws_hit(self, audio) -> bool:
+        """Run the lightweight keyword spotter over a captured chunk"""
+        try:
+            import struct
+            raw = audio.get_raw_data(convert_rate=self._kws.sample_rate,
+                                     convert_width=2)
+            frame_len = self._kws.frame_length
+            n = len(raw) // 2
+            samples = struct.unpack(f"<{n}h", raw[:n * 2])
+            for i in range(0, n - frame_len + 1, frame_len):
+                if self._kws.process(samples[i:i + frame_len]) >= 0:
+                    return True
+        except Exception as e:
+            logging.error(f"Wake-word gate error: {e}")
+            return True  # fail open so speech isn't silently dropped
+        return False
+
+    def _recognize_audio(self, audio) -> Optional[str]:
+        """Transcribe a captured audio chunk"""
+        if SPEECH_AVAILABLE and self.recognizer:
+            return self._recognize_google(audio)
         elif WHISPER_AVAILABLE:
-            return self._listen_whisper()
+            return self._recognize_whisper(audio)
         return None
-    
-    def _listen_google(self) -> Optional[str]:
-        """Listen using Google Speech Recognition"""
+
+    def _recognize_google(self, audio) -> Optional[str]:
+        """Transcribe using Google Speech Recognition"""
         try:
-            with self.microphone as source:
-                audio = self.recognizer.listen(source, timeout=1, phrase_time_limit=5)
-            
             text = self.recognizer.recognize_google(audio).lower()
             logging.info(f"Google recognized: {text}")
             return text
@@ -136,41 +304,55 @@ class SpeechEngine:
         except sr.RequestError as e:
             logging.error(f"Google Speech Recognition error: {e}")
         except Exception as e:
-            logging.error(f"Google listening error: {e}")
+            logging.error(f"Google recognition error: {e}")
         return None
-    
-    def _listen_whisper(self) -> Optional[str]:
-        """Listen using Whisper (offline)"""
+
+    def _recognize_whisper(self, audio) -> Optional[str]:
+        """Transcribe using Whisper (offline)"""
         try:
-            # This would need audio recording implementation
-            # For now, return None as placeholder
-            logging.info("Whisper listening not yet implemented")
-            return None
+            import numpy as np
+            raw = audio.get_raw_data(convert_rate=16000, convert_width=2)
+            samples = np.frombuffer(raw, np.int16).astype(np.float32) / 32768.0
+
+            if FASTER_WHISPER_AVAILABLE:
+                # beam_size=1 and VAD filtering avoid wasted compute on silence
+                segments, _ = self.whisper_model.transcribe(samples, beam_size=1,
+                                                            vad_filter=True)
+                text = " ".join(seg.text.strip() for seg in segments)
+            else:
+                result = self.whisper_model.transcribe(samples, fp16=False,
+                                                       language='en')
+                text = result.get("text", "")
+
+            text = text.strip().lower()
+            if text:
+                logging.info(f"Whisper recognized: {text}")
+                return text
         except Exception as e:
-            logging.error(f"Whisper listening error: {e}")
+            logging.error(f"Whisper recognition error: {e}")
         return None
     
     def _process_speech(self, text: str):
         """Process recognized speech text"""
-        # Check for wake words
-        if any(wake_word in text.lower() for wake_word in self.wake_words):
-            # Remove wake word from text
-            for wake_word in self.wake_words:
-                text = text.replace(wake_word, "").strip()
-            
-            if text and self.callback:
-                self.callback(text)
+        # Detect and strip wake words in a single regex pass
+        stripped, hits = self._wake_re.subn('', text)
+        if hits:
+            stripped = stripped.strip()
+            if stripped and self.callback:
+                self.callback(stripped)
     
     def add_wake_word(self, wake_word: str):
         """Add a new wake word"""
         if wake_word not in self.wake_words:
             self.wake_words.append(wake_word.lower())
+            self._rebuild_wake_regex()
             logging.info(f"Added wake word: {wake_word}")
-    
+
     def remove_wake_word(self, wake_word: str):
         """Remove a wake word"""
         if wake_word in self.wake_words:
             self.wake_words.remove(wake_word.lower())
+            self._rebuild_wake_regex()
             logging.info(f"Removed wake word: {wake_word}")
     
     def get_available_backends(self) -> Dict[str, bool]:
@@ -178,10 +360,23 @@ class SpeechEngine:
         return {
             "google": SPEECH_AVAILABLE,
             "whisper": WHISPER_AVAILABLE,
+            "vosk": self.use_vosk,
             "working": self._has_working_backend()
         }
     
     def cleanup(self):
         """Cleanup resources"""
         self.is_running = False
-        self.is_listening = False 
\ No newline at end of file
+        self.is_listening = False
+        if self._kws is not None:
+            try:
+                self._kws.delete()
+            except Exception as e:
+                logging.error(f"Wake-word gate cleanup failed: {e}")
+            self._kws = None
+        if self._mic_source is not None:
+            try:
+                self.microphone.__exit__(None, None, None)
+            except Exception as e:
+                logging.error(f"Microphone cleanup failed: {e}")
+            self._mic_source = None 
\ No newline at end of file
@@ -3,29 +3,57 @@ Voice Feedback Module
 Handles text-to-speech and audio feedback
 """
 
+import hashlib
+import io
+import itertools
+import json
+import tempfile
 import threading
 import time
 import logging
+from collections import OrderedDict
+from pathlib import Path
 from typing import Optional, Callable
 import queue
 
-# Initialize TTS flags
-TTS_AVAILABLE = False
-GTTS_AVAILABLE = False
+# Detect TTS backends without importing them; pygame alone costs
+# ~100 ms at import, so loading is deferred to first use
+import importlib.util
+TTS_AVAILABLE = importlib.util.find_spec("pyttsx3") is not None
+GTTS_AVAILABLE = (importlib.util.find_spec("gtts") is not None
+                  and importlib.util.find_spec("pygame") is not None)
 
-# Try to import text-to-speech libraries
-try:
-    import pyttsx3
-    TTS_AVAILABLE = True
-except ImportError:
-    pass
+_pyttsx3 = None
+_gtts = None
+_pygame = None
 
-try:
-    from gtts import gTTS
-    import pygame
-    GTTS_AVAILABLE = True
-except ImportError:
-    pass
+def _get_pyttsx3():
+    """Import pyttsx3 on first use and cache the module"""
+    global _pyttsx3
+    if _pyttsx3 is None:
+        import pyttsx3
+        _pyttsx3 = pyttsx3
+    return _pyttsx3
+
+def _get_gtts():
+    """Import gtts on first use and cache the module"""
+    global _gtts
+    if _gtts is None:
+        import gtts
+        _gtts = gtts
+    return _gtts
+
+def _get_pygame():
+    """Import pygame on first use and cache the module"""
+    global _pygame
+    if _pygame is None:
+        import pygame
+        _pygame = pygame
+    return _pygame
+
+# Sidecar caching the resolved TTS voice so startup skips enumerating
+# the platform's voice objects (slow COM calls on Windows SAPI)
+_VOICE_CACHE = Path.home() / ".cache" / "vocex" / "tts_voice.json"
 
 class VoiceFeedback:
     """Text-to-speech feedback system"""
@@ -34,16 +62,36 @@ class VoiceFeedback:
         self.voice_enabled = voice_enabled
         self.voice_rate = voice_rate
         self.tts_engine = None
-        self.feedback_queue = queue.Queue()
+        # Priority queue so low-priority chatter really does yield to
+        # higher-priority feedback; the counter breaks ties FIFO
+        self.feedback_queue = queue.PriorityQueue()
+        self._speak_counter = itertools.count()
+        # Hand-off between the synthesis stage and the playback stage;
+        # bounded so synthesis stays at most a couple phrases ahead
+        self._play_queue = queue.PriorityQueue(maxsize=4)
         self.is_speaking = False
+
+        # On-disk cache of synthesized phrases keyed by content hash so
+        # repeated feedback lines skip the gTTS network round-trip
+        self._tts_cache_dir = Path(tempfile.gettempdir()) / "vocex_tts"
+        self._tts_cache_dir.mkdir(exist_ok=True)
+        self._tts_cache = OrderedDict()
+        self._tts_cache_max = 256
+        self._active_channel = None
         
         # Initialize TTS engines
         self._init_tts_engines()
         
-        # Start feedback thread
+        # Start feedback pipeline
         if self.voice_enabled:
-            self.feedback_thread = threading.Thread(target=self._feedback_loop, daemon=True)
-            self.feedback_thread.start()
+            self._start_feedback_threads()
+
+    def _start_feedback_threads(self):
+        """Start the synthesis and playback stages of the pipeline"""
+        self.synth_thread = threading.Thread(target=self._synth_loop, daemon=True)
+        self.synth_thread.start()
+        self.feedback_thread = threading.Thread(target=self._feedback_loop, daemon=True)
+        self.feedback_thread.start()
     
     def _init_tts_engines(self):
         """Initialize available text-to-speech engines"""
@@ -51,21 +99,9 @@ class VoiceFeedback:
         
         if TTS_AVAILABLE:
             try:
-                self.tts_engine = pyttsx3.init()
+                self.tts_engine = _get_pyttsx3().init()
                 self.tts_engine.setProperty('rate', self.voice_rate)
-                
-                # Get available voices
-                voices = self.tts_engine.getProperty('voices')
-                if voices:
-                    # Try to set a female voice if available
-                    for voice in voices:
-                        if 'female' in voice.name.lower():
-                            self.tts_engine.setProperty('voice', voice.id)
-                            break
-                    else:
-                        # Use first available voice
-                        self.tts_engine.setProperty('voice', voices[0].id)
-                
+                self._select_voice()
                 logging.info("PyTTSx3 TTS engine initialized")
             except Exception as e:
                 logging.error(f"Failed to initialize PyTTSx3: {e}")
@@ -73,43 +109,158 @@ class VoiceFeedback:
         
         if GTTS_AVAILABLE:
             try:
-                pygame.mixer.init()
+                _get_pygame().mixer.init()
+                self._warm_gtts_transport()
                 logging.info("gTTS TTS engine initialized")
             except Exception as e:
                 logging.error(f"Failed to initialize gTTS: {e}")
                 GTTS_AVAILABLE = False
+
+    def _warm_gtts_transport(self):
+        """Reuse one pooled HTTPS session across gTTS calls.
+
+        gtts opens a fresh requests.Session - a full TLS handshake - for
+        every synthesis. Handing it a shared session with a pooled
+        adapter keeps the connection warm between utterances, and the
+        endpoint's DNS is resolved ahead of the first call.
+        """
+        try:
+            import socket
+            import requests
+            from requests.adapters import HTTPAdapter
+            import gtts.tts as gtts_tts
+
+            session = requests.Session()
+            session.mount('https://', HTTPAdapter(pool_connections=2, pool_maxsize=4))
+
+            class _PooledSession:
+                # gtts does `with requests.Session() as s:` - hand it the
+                # shared session and keep its connections alive on exit
+                def __enter__(self):
+                    return session
+
+                def __exit__(self, *exc):
+                    return False
+
+            class _RequestsShim:
+                Session = _PooledSession
+
+                def __getattr__(self, name):
+                    return getattr(requests, name)
+
+            # Swap the module reference inside gtts only; the global
+            # requests module is untouched
+            gtts_tts.requests = _RequestsShim()
+
+            threading.Thread(target=socket.getaddrinfo,
+                             args=("translate.google.com", 443),
+                             daemon=True).start()
+
+        except Exception as e:
+            logging.warning(f"Could not warm gTTS transport: {e}")
     
+    def _select_voice(self):
+        """Pick a voice, preferring the cached id over a full enumeration"""
+        try:
+            with open(_VOICE_CACHE) as f:
+                cached = json.load(f)
+            self.tts_engine.setProperty('voice', cached['voice_id'])
+            return
+        except (OSError, ValueError, KeyError):
+            pass  # Cache miss or stale - fall back to enumeration
+
+        # Get available voices
+        voice_id = None
+        voices = self.tts_engine.getProperty('voices')
+        if voices:
+            # Try to set a female voice if available
+            for voice in voices:
+                if 'female' in voice.name.lower():
+                    voice_id = voice.id
+                    break
+            else:
+                # Use first available voice
+                voice_id = voices[0].id
+            self.tts_engine.setProperty('voice', voice_id)
+
+        if voice_id:
+            try:
+                _VOICE_CACHE.parent.mkdir(parents=True, exist_ok=True)
+                with open(_VOICE_CACHE, 'w') as f:
+                    json.dump({"voice_id": voice_id, "rate": self.voice_rate}, f)
+            except OSError as e:
+                logging.warning(f"Could not cache TTS voice: {e}")
+
     def speak(self, text: str, priority: int = 1):
         """Speak text with priority (lower = higher priority)"""
         if not self.voice_enabled:
             return
-            
-        self.feedback_queue.put((priority, text))
-    
+
+        self.feedback_queue.put((priority, next(self._speak_counter), text))
+
     def speak_immediate(self, text: str):
         """Speak text immediately (interrupts current speech)"""
         if not self.voice_enabled:
             return
-            
-        # Clear queue and speak immediately
-        while not self.feedback_queue.empty():
+
+        # Abort the utterance in progress rather than racing the
+        # feedback thread with a queue drain; priority 0 jumps the queue
+        self._interrupt_speech()
+        self.feedback_queue.put((0, next(self._speak_counter), text))
+
+    def _interrupt_speech(self):
+        """Stop whatever the TTS backends are currently saying"""
+        try:
+            if TTS_AVAILABLE and self.tts_engine:
+                self.tts_engine.stop()
+            if self._active_channel is not None:
+                self._active_channel.stop()
+        except Exception as e:
+            logging.error(f"Speech interrupt error: {e}")
+
+    def _synth_loop(self):
+        """Synthesis stage: prepare the next phrase while one is playing"""
+        while self.voice_enabled:
             try:
-                self.feedback_queue.get_nowait()
+                priority, order, text = self.feedback_queue.get(timeout=1)
+                if not text:
+                    continue
+
+                if GTTS_AVAILABLE and not (TTS_AVAILABLE and self.tts_engine):
+                    # Synthesize ahead of playback so the network round-trip
+                    # overlaps the previous utterance's audio
+                    audio_path = self._tts_cache_path(text)
+                    if audio_path.exists():
+                        self._play_queue.put((priority, order, text, audio_path))
+                    else:
+                        # Straight into memory: playback never waits on a
+                        # disk write-then-read round-trip
+                        buf = self._synth_gtts(text, audio_path)
+                        self._play_queue.put((priority, order, text, buf))
+                else:
+                    # Local engines synthesize at playback time
+                    self._play_queue.put((priority, order, text, None))
+
             except queue.Empty:
-                break
-        
-        self.feedback_queue.put((0, text))  # Highest priority
-    
+                continue
+            except Exception as e:
+                logging.error(f"Synthesis error: {e}")
+
     def _feedback_loop(self):
-        """Main feedback loop for processing speech queue"""
+        """Playback stage: speak phrases the synthesis stage has prepared"""
         while self.voice_enabled:
             try:
-                # Get next feedback item
-                priority, text = self.feedback_queue.get(timeout=1)
-                
-                if text:
+                priority, _, text, audio_path = self._play_queue.get(timeout=1)
+
+                if audio_path is not None:
+                    self.is_speaking = True
+                    try:
+                        self._play_file(audio_path)
+                    finally:
+                        self.is_speaking = False
+                elif text:
                     self._speak_text(text)
-                    
+
             except queue.Empty:
                 continue
             except Exception as e:
@@ -140,29 +291,68 @@ class VoiceFeedback:
         except Exception as e:
             logging.error(f"PyTTSx3 speech error: {e}")
     
+    def _tts_cache_path(self, text: str) -> Path:
+        """Content-addressed cache path for a synthesized phrase"""
+        key = hashlib.sha256(f"{text}|en|False".encode()).hexdigest()
+
+        # Bounded LRU: refresh on use, evict the oldest file past the cap
+        self._tts_cache.pop(key, None)
+        self._tts_cache[key] = time.time()
+        while len(self._tts_cache) > self._tts_cache_max:
+            old_key, _ = self._tts_cache.popitem(last=False)
+            try:
+                (self._tts_cache_dir / f"{old_key}.mp3").unlink()
+            except OSError:
+                pass
+
+        return self._tts_cache_dir / f"{key}.mp3"
+
+    def _synth_gtts(self, text: str, audio_path: Path) -> io.BytesIO:
+        """Synthesize into memory, persisting a copy for future cache hits"""
+        buf = io.BytesIO()
+        _get_gtts().gTTS(text=text, lang='en', slow=False).write_to_fp(buf)
+        try:
+            audio_path.write_bytes(buf.getvalue())
+        except OSError as e:
+            logging.warning(f"Could not cache TTS audio: {e}")
+        buf.seek(0)
+        return buf
+
     def _speak_gtts(self, text: str):
         """Speak using gTTS"""
         try:
-            # Create temporary audio file
-            tts = gTTS(text=text, lang='en', slow=False)
-            temp_file = f"temp_speech_{int(time.time())}.mp3"
-            tts.save(temp_file)
-            
-            # Play audio
-            pygame.mixer.music.load(temp_file)
-            pygame.mixer.music.play()
-            
-            # Wait for playback to complete
-            while pygame.mixer.music.get_busy():
-                time.sleep(0.1)
-            
-            # Clean up
-            pygame.mixer.music.unload()
-            import os
-            os.remove(temp_file)
-            
+            # Only hit the gTTS API on a cache miss
+            audio_path = self._tts_cache_path(text)
+            if audio_path.exists():
+                self._play_file(audio_path)
+            else:
+                self._play_file(self._synth_gtts(text, audio_path))
+
         except Exception as e:
             logging.error(f"gTTS speech error: {e}")
+
+    def _play_file(self, source):
+        """Play synthesized audio - a cached file path or in-memory buffer"""
+        try:
+            # Play audio on a channel; a Sound keeps the whole clip in
+            # memory so playback needs no further disk reads
+            pygame = _get_pygame()
+            if isinstance(source, Path):
+                sound = pygame.mixer.Sound(str(source))
+            else:
+                source.seek(0)
+                sound = pygame.mixer.Sound(file=source)
+            self._active_channel = sound.play()
+
+            # Wait at 5ms granularity instead of 100ms sleeps, so
+            # back-to-back utterances don't inherit a polling tail
+            clock = pygame.time.Clock()
+            while self._active_channel is not None and self._active_channel.get_busy():
+                clock.tick(200)
+            self._active_channel = None
+
+        except Exception as e:
+            logging.error(f"Audio playback error: {e}")
     
     def set_voice_rate(self, rate: int):
         """Set speech rate (words per minute)"""
@@ -190,8 +380,7 @@ class VoiceFeedback:
         """Enable voice feedback"""
         self.voice_enabled = True
         if not hasattr(self, 'feedback_thread') or not self.feedback_thread.is_alive():
-            self.feedback_thread = threading.Thread(target=self._feedback_loop, daemon=True)
-            self.feedback_thread.start()
+            self._start_feedback_threads()
     
     def disable_voice(self):
         """Disable voice feedback"""
@@ -217,5 +406,5 @@ class VoiceFeedback:
         self.voice_enabled = False
         if TTS_AVAILABLE and self.tts_engine:
             self.tts_engine.stop()
-        if GTTS_AVAILABLE:
-            pygame.mixer.quit() 
\ No newline at end of file
+        if GTTS_AVAILABLE and _pygame is not None:
+            _pygame.mixer.quit() 
\ No newline at end of file
@@ -1,38 +1,203 @@
 import speech_recognition as sr
+import re
 import subprocess
+import shutil
+import webbrowser
 import os
 import sys
 import threading
 import time
+import types
 import pyautogui
 import tkinter as tk
 from tkinter import ttk, messagebox
 import json
-from datetime import datetime
+import multiprocessing
+import queue
+from collections import deque
+from urllib.parse import quote_plus
+
+# Optional O(len(text)) multi-keyword matcher for command dispatch
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Optional numpy path: phrase-level RMS gating runs as one SIMD
+# reduction instead of a per-frame Python loop
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Optional PIL path: static window chrome is rasterized once instead of
+# going through themed ttk widgets
+try:
+    from PIL import Image, ImageDraw, ImageFont, ImageTk
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+# Optional on-device STT; usable only when both the vosk package and an
+# unpacked "model" directory (what recognize_vosk loads) are present -
+# without the model recognize_vosk returns a help string, not JSON
+try:
+    import vosk  # noqa: F401
+    VOSK_AVAILABLE = os.path.isdir("model")
+except ImportError:
+    VOSK_AVAILABLE = False
 import psutil
 
+
+# Text injection: on Windows one SendInput call types a whole string
+# (two KEYEVENTF_UNICODE events per UTF-16 unit), instead of pyautogui's
+# keystroke-at-a-time loop with inter-key sleeps
+if sys.platform == "win32":
+    import ctypes
+    import struct
+
+    _INPUT_KEYBOARD = 1
+    _KEYEVENTF_UNICODE = 0x0004
+    _KEYEVENTF_KEYUP = 0x0002
+
+    class _KEYBDINPUT(ctypes.Structure):
+        _fields_ = [("wVk", ctypes.c_ushort),
+                    ("wScan", ctypes.c_ushort),
+                    ("dwFlags", ctypes.c_ulong),
+                    ("time", ctypes.c_ulong),
+                    ("dwExtraInfo", ctypes.c_void_p)]
+
+    class _INPUT(ctypes.Structure):
+        class _U(ctypes.Union):
+            _fields_ = [("ki", _KEYBDINPUT),
+                        ("padding", ctypes.c_ubyte * 32)]
+        _anonymous_ = ("u",)
+        _fields_ = [("type", ctypes.c_ulong), ("u", _U)]
+
+    def _send_unicode_batch(text):
+        """Type a whole string with a single SendInput syscall"""
+        # utf-16-le units handle characters outside the BMP correctly
+        encoded = text.encode("utf-16-le")
+        units = struct.unpack(f"<{len(encoded) // 2}H", encoded)
+        inputs = (_INPUT * (2 * len(units)))()
+        for i, unit in enumerate(units):
+            for j, flags in ((2 * i, _KEYEVENTF_UNICODE),
+                             (2 * i + 1, _KEYEVENTF_UNICODE | _KEYEVENTF_KEYUP)):
+                inputs[j].type = _INPUT_KEYBOARD
+                inputs[j].ki.wScan = unit
+                inputs[j].ki.dwFlags = flags
+        sent = ctypes.windll.user32.SendInput(len(inputs), inputs,
+                                              ctypes.sizeof(_INPUT))
+        return sent == len(inputs)
+else:
+    def _send_unicode_batch(text):
+        """No SendInput off Windows - callers fall back to pyautogui"""
+        return False
+
+
+
+def _on_word_boundary(text, start, end):
+    """True when text[start:end] is not embedded inside a larger word
+
+    Keeps automaton hits consistent with the \\b-anchored regex fallback,
+    so optional pyahocorasick never changes dispatch semantics.
+    """
+    return ((start == 0 or not text[start - 1].isalnum())
+            and (end == len(text) or not text[end].isalnum()))
+
+
+# Command keywords bound to handler attribute names; instances build
+# their dispatch mapping from this one shared table
+_CMD_TABLE = (
+    ("open", "open_program"),
+    ("launch", "open_program"),
+    ("start", "open_program"),
+    ("write", "write_text"),
+    ("type", "write_text"),
+    ("search", "search_web"),
+    ("google", "search_web"),
+    ("find", "search_web"),
+    ("close", "close_program"),
+    ("exit", "close_program"),
+    ("quit", "close_program"),
+)
+
+# Ambient energy threshold varies slowly, so calibration is reusable
+# across launches for a few hours
+_CALIBRATION_CACHE = os.path.join(os.path.expanduser("~"), ".xizo_cache.json")
+_CALIBRATION_MAX_AGE = 6 * 3600
+
+# Constant prefix hoisted so search_web only pays for quoting the query
+_SEARCH_URL = "https://www.google.com/search?q="
+
+# Launched programs detach and get no inherited console (no flash, no
+# handle inheritance); resolved paths already skip the PATH walk
+if sys.platform == "win32":
+    _POPEN_KW = {"creationflags": (subprocess.CREATE_NO_WINDOW
+                                   | subprocess.DETACHED_PROCESS),
+                 "close_fds": True}
+else:
+    _POPEN_KW = {"close_fds": True}
+
+
+def _recognizer_worker(audio_q, text_q, stop_ev):
+    """Transcribe captured phrases in a child process
+
+    The worker runs under its own interpreter and GIL, so STT decode can
+    never contend with the Tk mainloop; only picklable AudioData and
+    result strings cross the process boundary.
+    """
+    recognizer = sr.Recognizer()
+    while not stop_ev.is_set():
+        try:
+            audio = audio_q.get(timeout=1)
+        except queue.Empty:
+            continue
+        try:
+            if VOSK_AVAILABLE:
+                try:
+                    text = json.loads(
+                        recognizer.recognize_vosk(audio)).get("text", "").strip()
+                except Exception:
+                    # Local decode failed; use the cloud path for this phrase
+                    text = recognizer.recognize_google(audio).lower()
+                else:
+                    if not text:
+                        continue
+                    text = text.lower()
+            else:
+                text = recognizer.recognize_google(audio).lower()
+            text_q.put(("text", text))
+        except sr.UnknownValueError:
+            pass  # No speech detected
+        except sr.RequestError as e:
+            text_q.put(("error", str(e)))
+        except Exception as e:
+            # Never let one bad phrase kill the worker; report and poll on
+            text_q.put(("error", str(e)))
+
 class XizoAssistant:
     def __init__(self):
         self.recognizer = sr.Recognizer()
-        self.microphone = sr.Microphone()
+        # 16 kHz with 20 ms buffers: capture-to-callback latency is
+        # bounded by the chunk size, and ASR wants 16 kHz anyway
+        self.microphone = sr.Microphone(sample_rate=16000, chunk_size=320)
         self.is_listening = False
         self.is_running = True
         self.wake_word = "xizo"
+        # memmem-backed bytes search beats the unicode code-point scan
+        # once per-chunk partials start arriving from streaming STT
+        self._wake_bytes = self.wake_word.encode()
+        # Transcripts conventionally lead with the wake word; an anchored
+        # .match bails at position 0 on the common non-command phrase
+        self._wake_re = re.compile(r'\s*' + re.escape(self.wake_word) + r'\b',
+                                   re.IGNORECASE)
         
         # Command patterns
-        self.commands = {
-            "open": self.open_program,
-            "launch": self.open_program,
-            "start": self.open_program,
-            "write": self.write_text,
-            "type": self.write_text,
-            "search": self.search_web,
-            "google": self.search_web,
-            "find": self.search_web,
-            "close": self.close_program,
-            "exit": self.close_program,
-            "quit": self.close_program
-        }
+        self.commands = types.MappingProxyType(
+            {keyword: getattr(self, attr) for keyword, attr in _CMD_TABLE})
         
         # Common programs mapping
         self.programs = {
@@ -48,17 +213,127 @@ class XizoAssistant:
             "control panel": "control.exe",
             "task manager": "taskmgr.exe"
         }
-        
+
+        # Resolve program names to absolute paths once, instead of a
+        # PATH walk on every launch
+        self.programs = {name: (shutil.which(exe) or exe)
+                         for name, exe in self.programs.items()}
+
+        # Precompiled matchers so dispatch is one scan per utterance
+        self._cmd_re = re.compile(
+            r'\b(' + '|'.join(sorted(map(re.escape, self.commands), key=len, reverse=True)) + r')\b')
+        self._prog_re = re.compile(
+            r'\b(' + '|'.join(sorted(map(re.escape, self.programs), key=len, reverse=True)) + r')\b')
+        # Fused wake+command+args pattern: the common "xizo <cmd> <args>"
+        # shape dispatches in one scan with no intermediate strings
+        self._fused_re = re.compile(
+            re.escape(self.wake_word) + r'\s+(?P<cmd>'
+            + '|'.join(sorted(map(re.escape, self.commands), key=len, reverse=True))
+            + r')\b\s*(?P<args>.*)')
+
+        # Aho-Corasick automaton keeps dispatch one linear scan however
+        # many commands get registered (regex path is the fallback)
+        self._cmd_aho = None
+        if AHOCORASICK_AVAILABLE:
+            automaton = ahocorasick.Automaton()
+            for keyword in self.commands:
+                automaton.add_word(keyword, (len(keyword), keyword))
+            automaton.make_automaton()
+            self._cmd_aho = automaton
+
+        # Short-lived process snapshot shared by consecutive close commands
+        self._proc_index = None
+        self._proc_index_ts = 0.0
+
+        # Stop handle returned by the background listener
+        self._stop_bg = None
+        # Captured utterances cross to the recognizer child process here
+        # so transcription overlaps both capture and GUI redraw
+        self._audio_q = multiprocessing.Queue(maxsize=4)
+        self._text_q = multiprocessing.Queue()
+        # Serializes microphone openers: the background calibration
+        # thread vs the background listener
+        self._mic_lock = threading.Lock()
+        # Stop event is per-worker; created in start_listening
+        self._stop_ev = None
+        self._recognizer_proc = None
+
         self.setup_gui()
         self.adjust_for_ambient_noise()
         
     def adjust_for_ambient_noise(self):
-        """Adjust the recognizer sensitivity to ambient noise"""
-        print("Adjusting for ambient noise... Please be quiet.")
-        with self.microphone as source:
-            self.recognizer.adjust_for_ambient_noise(source, duration=1)
+        """Adjust the recognizer sensitivity to ambient noise
+
+        A fresh cached threshold skips the blocking 1s warmup; the mic is
+        then recalibrated in the background and the cache refreshed.
+        """
+        if self._load_calibration():
+            print("Using cached ambient noise calibration.")
+            threading.Thread(target=self._calibrate, daemon=True).start()
+            return
+        self._calibrate()
+
+    def _calibrate(self):
+        """Sample ambient noise for 1s and persist the measured threshold"""
+        with self._mic_lock:
+            if self.is_listening:
+                # The background listener owns the stream; skip rather
+                # than fight it for the device
+                return
+            print("Adjusting for ambient noise... Please be quiet.")
+            with self.microphone as source:
+                self.recognizer.adjust_for_ambient_noise(source, duration=1)
+        self._save_calibration()
         print("Ambient noise adjustment complete.")
+
+    def _load_calibration(self):
+        """Restore a recent energy threshold from the on-disk cache"""
+        try:
+            with open(_CALIBRATION_CACHE) as f:
+                cached = json.load(f)
+            if time.time() - cached["ts"] < _CALIBRATION_MAX_AGE:
+                self.recognizer.energy_threshold = cached["energy"]
+                self.recognizer.dynamic_energy_threshold = True
+                return True
+        except (OSError, ValueError, KeyError):
+            pass
+        return False
+
+    def _save_calibration(self):
+        try:
+            with open(_CALIBRATION_CACHE, "w") as f:
+                json.dump({"energy": self.recognizer.energy_threshold,
+                           "ts": time.time()}, f)
+        except OSError:
+            pass
     
+    def _build_title(self, parent):
+        """Build the static title banner
+
+        With PIL installed the banner is rasterized once and blitted as a
+        single Canvas image, so Tcl never re-measures a themed label for
+        chrome that can't change; otherwise the plain ttk.Label stands.
+        """
+        if PIL_AVAILABLE:
+            try:
+                try:
+                    font = ImageFont.truetype("arial.ttf", 20)
+                except OSError:
+                    font = ImageFont.load_default()
+                image = Image.new("RGB", (380, 36), "#dcdad5")
+                ImageDraw.Draw(image).text((10, 6), "Xizo Voice Assistant",
+                                           fill="black", font=font)
+                # Keep a reference; Tk only borrows the PhotoImage
+                self._banner = ImageTk.PhotoImage(image)
+                canvas = tk.Canvas(parent, width=380, height=36,
+                                   highlightthickness=0, bd=0)
+                canvas.create_image(0, 0, anchor="nw", image=self._banner)
+                return canvas
+            except Exception:
+                pass
+        return ttk.Label(parent, text="🧠 Xizo Voice Assistant",
+                         font=("Arial", 16, "bold"))
+
     def setup_gui(self):
         """Setup the GUI interface"""
         self.root = tk.Tk()
@@ -75,8 +350,7 @@ class XizoAssistant:
         main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         
         # Title
-        title_label = ttk.Label(main_frame, text="🧠 Xizo Voice Assistant", 
-                               font=("Arial", 16, "bold"))
+        title_label = self._build_title(main_frame)
         title_label.grid(row=0, column=0, columnspan=2, pady=(0, 20))
         
         # Status
@@ -108,14 +382,60 @@ class XizoAssistant:
         
         # Bind close event
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
+
+        # Cross-thread logging: worker threads enqueue, the Tk thread
+        # drains in batches (Tk widgets are not thread-safe)
+        self._log_q = queue.Queue()
+        self._log_ring = deque(maxlen=1000)
+        # Timestamp string is reused for every message within one second
+        self._ts_key = -1
+        self._ts_str = ""
+        # Autoscroll request outstanding for the log widget
+        self._scroll_pending = False
+        # Pending write_text fragments; flushed after 50ms of quiet
+        self._write_buf = []
+        self._write_after = None
+        self.root.after(100, self._flush_log)
         
+    def _do_scroll(self):
+        """Pin the log view to the bottom once Tk goes idle"""
+        self._scroll_pending = False
+        self.log_text.yview_moveto(1.0)
+
     def log_message(self, message):
-        """Add message to log with timestamp"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        log_entry = f"[{timestamp}] {message}\n"
-        self.log_text.insert(tk.END, log_entry)
-        self.log_text.see(tk.END)
-        print(log_entry.strip())
+        """Queue a log line; the Tk thread renders it on the next tick"""
+        now = int(time.time())
+        if now != self._ts_key:
+            self._ts_key = now
+            self._ts_str = time.strftime("%H:%M:%S", time.localtime(now))
+        self._log_q.put(f"[{self._ts_str}] {message}\n")
+
+    def _flush_log(self):
+        """Drain queued log lines into the widget in one batched insert"""
+        batch = []
+        try:
+            while True:
+                batch.append(self._log_q.get_nowait())
+        except queue.Empty:
+            pass
+
+        if batch:
+            self._log_ring.extend(batch)
+            self.log_text.insert(tk.END, ''.join(batch))
+            # Trim the widget so it never outgrows the ring
+            overflow = (int(self.log_text.index('end-1c').split('.')[0])
+                        - self._log_ring.maxlen)
+            if overflow > 0:
+                self.log_text.delete('1.0', f'{overflow + 1}.0')
+            # Coalesce autoscroll: one layout pass per idle cycle, not
+            # one per inserted batch
+            if not self._scroll_pending:
+                self._scroll_pending = True
+                self.root.after_idle(self._do_scroll)
+            print(''.join(batch), end='')
+
+        if self.is_running:
+            self.root.after(100, self._flush_log)
     
     def toggle_listening(self):
         """Toggle listening state"""
@@ -131,56 +451,136 @@ class XizoAssistant:
         self.status_label.config(text="Status: Listening...")
         self.log_message("Started listening for voice commands")
         
-        # Start listening thread
-        self.listen_thread = threading.Thread(target=self.listen_loop, daemon=True)
-        self.listen_thread.start()
+        # Background listener opens the PortAudio stream once and holds
+        # it for the whole session (no per-phrase setup/teardown),
+        # delivering utterances from its own worker thread
+        # Wait out any in-flight background calibration before the
+        # listener takes the device
+        with self._mic_lock:
+            self._stop_bg = self.recognizer.listen_in_background(
+                self.microphone, self._on_audio, phrase_time_limit=5)
+        # Fresh event per worker: clearing a shared one could revive a
+        # previous worker still inside its queue-timeout window
+        self._stop_ev = multiprocessing.Event()
+        self._recognizer_proc = multiprocessing.Process(
+            target=_recognizer_worker,
+            args=(self._audio_q, self._text_q, self._stop_ev),
+            daemon=True)
+        self._recognizer_proc.start()
+        self.root.after(50, self._drain_text)
     
     def stop_listening(self):
         """Stop listening for voice commands"""
         self.is_listening = False
+        if self._stop_bg is not None:
+            self._stop_bg(wait_for_stop=False)
+            self._stop_bg = None
+        # Daemon worker notices the event within its queue timeout
+        if self._stop_ev is not None:
+            self._stop_ev.set()
+        self._recognizer_proc = None
         self.listen_button.config(text="Start Listening")
         self.status_label.config(text="Status: Ready")
         self.log_message("Stopped listening")
     
-    def listen_loop(self):
-        """Main listening loop"""
-        while self.is_listening and self.is_running:
+    def _on_audio(self, recognizer, audio):
+        """Queue a captured utterance; recognition happens off this thread"""
+        if not (self.is_listening and self.is_running):
+            return
+
+        # Second-stage VAD: a silent or noise-only phrase is cheaper to
+        # reject here than to pickle across to the recognizer process
+        if NUMPY_AVAILABLE and not self._has_speech(audio):
+            return
+
+        try:
+            self._audio_q.put_nowait(audio)
+        except queue.Full:
+            # Ring semantics: discard the oldest phrase, keep the newest,
+            # so buffered PCM stays capped at maxsize * phrase_time_limit
             try:
-                with self.microphone as source:
-                    audio = self.recognizer.listen(source, timeout=1, phrase_time_limit=5)
-                
-                try:
-                    text = self.recognizer.recognize_google(audio).lower()
-                    self.log_message(f"Heard: {text}")
-                    
-                    if self.wake_word in text:
-                        self.process_command(text)
-                    
-                except sr.UnknownValueError:
-                    pass  # No speech detected
-                except sr.RequestError as e:
-                    self.log_message(f"Speech recognition error: {e}")
-                    
-            except Exception as e:
-                if self.is_listening:  # Only log if we're supposed to be listening
-                    self.log_message(f"Listening error: {e}")
-                time.sleep(0.1)
-    
+                self._audio_q.get_nowait()
+            except queue.Empty:
+                pass
+            self._audio_q.put_nowait(audio)
+
+    def _has_speech(self, audio):
+        """RMS energy check over a whole captured phrase
+
+        One vectorized einsum reduction over the 16-bit samples, compared
+        against half the recognizer's calibrated threshold so borderline
+        speech still gets through.
+        """
+        samples = np.frombuffer(audio.frame_data, dtype=np.int16)
+        if samples.size == 0:
+            return False
+        samples = samples.astype(np.float64)
+        rms = (np.einsum('i,i->', samples, samples) / samples.size) ** 0.5
+        return rms >= self.recognizer.energy_threshold * 0.5
+
+    def _drain_text(self):
+        """Dispatch recognized text from the child process on the Tk thread"""
+        while True:
+            try:
+                kind, payload = self._text_q.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "error":
+                self.log_message(f"Speech recognition error: {payload}")
+                continue
+            self.log_message(f"Heard: {payload}")
+            # Anchored fast path first; the bytes scan still catches a
+            # wake word spoken mid-sentence
+            if (self._wake_re.match(payload)
+                    or self._wake_bytes in payload.encode("ascii", "ignore")):
+                self.process_command(payload)
+        if self.is_listening and self.is_running:
+            self.root.after(50, self._drain_text)
+
     def process_command(self, text):
         """Process voice command"""
-        # Remove wake word
-        command_text = text.replace(self.wake_word, "").strip()
+        # Fast path: "<wake> <cmd> <args>" resolves in one fused scan
+        fused = self._fused_re.search(text)
+        if fused:
+            try:
+                self.commands[fused['cmd']](fused['args'].strip())
+                return
+            except Exception as e:
+                self.log_message(f"Error executing command: {e}")
+                return
+
+        # Remove the wake word: slice past an anchored match instead of
+        # allocating a replace()'d copy when it leads the transcript
+        wake = self._wake_re.match(text)
+        if wake:
+            command_text = text[wake.end():].strip()
+        else:
+            command_text = text.replace(self.wake_word, "").strip()
         
-        # Find matching command
-        for cmd_keyword, cmd_function in self.commands.items():
-            if cmd_keyword in command_text:
-                try:
-                    # Extract arguments
-                    args = command_text.replace(cmd_keyword, "").strip()
-                    cmd_function(args)
-                    return
-                except Exception as e:
-                    self.log_message(f"Error executing command: {e}")
+        # Find matching command with a single scan over the text
+        found = None
+        if self._cmd_aho is not None:
+            for end, (length, keyword) in self._cmd_aho.iter(command_text):
+                start = end - length + 1
+                if not _on_word_boundary(command_text, start, end + 1):
+                    continue
+                # Earliest match wins; on overlap the longest keyword wins
+                if found is None or start < found[1] or (start == found[1] and length > len(found[0])):
+                    found = (keyword, start, end + 1)
+        else:
+            match = self._cmd_re.search(command_text)
+            if match:
+                found = (match.group(1), match.start(), match.end())
+
+        if found:
+            keyword, start, end = found
+            try:
+                # Extract arguments
+                args = (command_text[:start] + command_text[end:]).strip()
+                self.commands[keyword](args)
+                return
+            except Exception as e:
+                self.log_message(f"Error executing command: {e}")
         
         # If no specific command found, treat as text to write
         self.write_text(command_text)
@@ -188,19 +588,24 @@ class XizoAssistant:
     def open_program(self, program_name):
         """Open a program or file"""
         program_name = program_name.strip()
-        
+
+        # Resolve a known program mentioned anywhere in the spoken args
+        prog_match = self._prog_re.search(program_name)
+        if prog_match:
+            program_name = prog_match.group(1)
+
         # Check if it's a known program
         if program_name in self.programs:
             program_path = self.programs[program_name]
             try:
-                subprocess.Popen(program_path)
+                subprocess.Popen([program_path], **_POPEN_KW)
                 self.log_message(f"Opened {program_name}")
             except Exception as e:
                 self.log_message(f"Failed to open {program_name}: {e}")
         else:
             # Try to open as a file or program
             try:
-                subprocess.Popen(program_name)
+                subprocess.Popen([program_name], **_POPEN_KW)
                 self.log_message(f"Opened {program_name}")
             except Exception as e:
                 self.log_message(f"Failed to open {program_name}: {e}")
@@ -209,10 +614,31 @@ class XizoAssistant:
         """Write text to active application"""
         if not text.strip():
             return
-            
+
+        # Debounce: streaming STT can revise a partial hypothesis several
+        # times in quick succession; batching avoids typing stale prefixes
+        self._write_buf.append(text)
+        if self._write_after is not None:
+            self.root.after_cancel(self._write_after)
+        self._write_after = self.root.after(50, self._flush_writes)
+
+    def _flush_writes(self):
+        """Inject buffered text fragments as one batch"""
+        self._write_after = None
+        fragments, self._write_buf = self._write_buf, []
+        if not fragments:
+            return
+
+        # A fragment that extends its predecessor is a revision of the
+        # same utterance; only the newest version gets typed
+        text = fragments[0]
+        for frag in fragments[1:]:
+            text = frag if frag.startswith(text) else f"{text} {frag}"
+
         try:
-            # Type the text
-            pyautogui.write(text)
+            # One batched syscall on Windows; per-keystroke fallback off it
+            if not _send_unicode_batch(text):
+                pyautogui.write(text)
             self.log_message(f"Wrote text: {text}")
         except Exception as e:
             self.log_message(f"Failed to write text: {e}")
@@ -223,33 +649,60 @@ class XizoAssistant:
             return
             
         try:
-            search_url = f"https://www.google.com/search?q={query.replace(' ', '+')}"
-            subprocess.Popen(["start", search_url], shell=True)
+            # Hand the URL straight to the OS handler - no cmd.exe spawn,
+            # and quote_plus keeps punctuation in spoken queries intact
+            webbrowser.open_new_tab(_SEARCH_URL + quote_plus(query))
             self.log_message(f"Searched for: {query}")
         except Exception as e:
             self.log_message(f"Failed to search: {e}")
     
+    def _get_proc_index(self, max_age=2.0):
+        """Snapshot the process table into a name->pids index with a short TTL"""
+        now = time.monotonic()
+        if self._proc_index is None or now - self._proc_index_ts > max_age:
+            index = {}
+            for proc in psutil.process_iter(['pid', 'name']):
+                name = proc.info['name']
+                if name:
+                    index.setdefault(name.lower(), []).append(proc.info['pid'])
+            self._proc_index = index
+            self._proc_index_ts = now
+        return self._proc_index
+
     def close_program(self, program_name):
         """Close a program"""
         program_name = program_name.strip()
-        
+
+        prog_match = self._prog_re.search(program_name)
+        if prog_match:
+            program_name = prog_match.group(1)
+
         try:
-            if program_name in self.programs:
-                program_path = self.programs[program_name]
-                # Kill process by name
-                for proc in psutil.process_iter(['pid', 'name']):
-                    if proc.info['name'] and program_path.lower() in proc.info['name'].lower():
-                        proc.terminate()
-                        self.log_message(f"Closed {program_name}")
-                        return
-            else:
-                # Try to close by name
-                for proc in psutil.process_iter(['pid', 'name']):
-                    if proc.info['name'] and program_name.lower() in proc.info['name'].lower():
-                        proc.terminate()
-                        self.log_message(f"Closed {program_name}")
-                        return
-                        
+            # Match against a cached snapshot instead of re-walking the
+            # process table for every close command
+            # programs values are which()-resolved launch paths; compare
+            # their basenames against the bare names in the process index
+            target = os.path.basename(
+                self.programs.get(program_name, program_name)).lower()
+            index = self._get_proc_index()
+            # Hashed exact-name hit first; substring sweep only as fallback
+            pids = index.get(target)
+            if pids is None:
+                for name, name_pids in index.items():
+                    if target in name:
+                        pids = name_pids
+                        break
+            if pids:
+                for pid in pids:
+                    try:
+                        psutil.Process(pid).terminate()
+                    except psutil.NoSuchProcess:
+                        pass
+                # Snapshot is stale once something was terminated
+                self._proc_index = None
+                self.log_message(f"Closed {program_name}")
+                return
+
             self.log_message(f"Could not find {program_name} to close")
         except Exception as e:
             self.log_message(f"Failed to close {program_name}: {e}")
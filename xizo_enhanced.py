@@ -8,6 +8,10 @@ from tkinter import ttk, messagebox
 import logging
 import json
 import os
+import queue
+import sys
+import time
+from collections import deque
 from datetime import datetime
 import threading
 
@@ -17,6 +21,20 @@ from voice_control import SpeechEngine, CommandProcessor, VoiceFeedback
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# C-level JSON codec when available; stdlib json is the fallback
+try:
+    import orjson
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, indent=2).encode()
+
+    _loads = json.loads
+
 class XizoEnhanced:
     """Enhanced Xizo Voice Assistant with advanced voice control"""
     
@@ -28,6 +46,34 @@ class XizoEnhanced:
         self.command_processor = CommandProcessor()
         self.voice_feedback = VoiceFeedback(voice_enabled=True)
         
+        # Last rendered status, so unchanged ticks skip the widget entirely
+        self._last_status_snapshot = None
+        self._status_after_id = None
+        # Backend availability barely changes; probe it on a 10 s TTL
+        self._backends_cache = (0.0, None)
+        self._history_row_count = 0
+        self._config_cache = None
+
+        # Ring-buffer bound on the log widget so a long-running session
+        # doesn't accumulate unbounded Text state
+        self._log_lines = 0
+        self._log_max = 1000
+
+        # Timestamps only have 1 s resolution, so format at most once
+        # per second however bursty the log gets
+        self._last_ts_sec = 0
+        self._last_ts_str = ''
+
+        # Bursty log lines are buffered and rendered with one insert per
+        # idle tick instead of one widget round-trip per line
+        self._log_buf = deque()
+        self._log_flush_scheduled = False
+
+        # TTS hops onto its own queue so slow synthesis never blocks the
+        # recognition callback; when backed up, stale phrases are dropped
+        self._tts_q = queue.Queue(maxsize=2)
+        threading.Thread(target=self._speaker_loop, daemon=True).start()
+
         # Setup GUI
         self.setup_gui()
         
@@ -52,15 +98,26 @@ class XizoEnhanced:
         self.notebook = ttk.Notebook(self.root)
         self.notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
+        # Settings variables live here so load_config/save_settings work
+        # before the Settings tab has ever been opened
+        self.voice_feedback_var = tk.BooleanVar(value=True)
+        self.speech_rate_var = tk.IntVar(value=150)
+
         # Main tab
         self.setup_main_tab()
-        
-        # Settings tab
-        self.setup_settings_tab()
-        
-        # History tab
-        self.setup_history_tab()
-        
+
+        # Settings/History tabs are built on first visit, so cold start
+        # only pays for the widgets actually on screen
+        self._settings_frame = ttk.Frame(self.notebook)
+        self.notebook.add(self._settings_frame, text="Settings")
+        self._settings_built = False
+
+        self._history_frame = ttk.Frame(self.notebook)
+        self.notebook.add(self._history_frame, text="History")
+        self._history_built = False
+
+        self.notebook.bind('<<NotebookTabChanged>>', self._on_tab_changed)
+
         # Bind close event
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
         
@@ -78,12 +135,22 @@ class XizoEnhanced:
         status_frame = ttk.LabelFrame(main_frame, text="System Status", padding="10")
         status_frame.pack(fill=tk.X, padx=10, pady=(0, 10))
         
-        self.status_text = tk.Text(status_frame, height=6, width=70, wrap=tk.WORD)
-        status_scrollbar = ttk.Scrollbar(status_frame, orient=tk.VERTICAL, command=self.status_text.yview)
-        self.status_text.configure(yscrollcommand=status_scrollbar.set)
-        
-        self.status_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        status_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        # StringVar-driven labels: far cheaper to repaint than a Text
+        # widget, and only labels whose value changed get redrawn
+        self._status_vars = {}
+        fields = [('google', 'Google'), ('whisper', 'Whisper'),
+                  ('working', 'Working'), ('enabled', 'Feedback'),
+                  ('pyttsx3', 'PyTTSx3'), ('gtts', 'gTTS'),
+                  ('rate', 'Rate'), ('listening', 'Listening'),
+                  ('speaking', 'Speaking')]
+        for i, (key, label) in enumerate(fields):
+            row, col = divmod(i, 3)
+            ttk.Label(status_frame, text=f"{label}:").grid(
+                row=row, column=2 * col, sticky=tk.W, padx=(0, 4), pady=2)
+            var = tk.StringVar(value='✗')
+            ttk.Label(status_frame, textvariable=var).grid(
+                row=row, column=2 * col + 1, sticky=tk.W, padx=(0, 25), pady=2)
+            self._status_vars[key] = var
         
         # Control frame
         control_frame = ttk.LabelFrame(main_frame, text="Voice Control", padding="10")
@@ -116,18 +183,29 @@ class XizoEnhanced:
         log_frame = ttk.LabelFrame(main_frame, text="Command Log", padding="10")
         log_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
         
-        self.log_text = tk.Text(log_frame, height=12, width=70, wrap=tk.WORD)
+        self.log_text = tk.Text(log_frame, height=12, width=70, wrap=tk.WORD,
+                                undo=False, autoseparators=False, maxundo=0)
         log_scrollbar = ttk.Scrollbar(log_frame, orient=tk.VERTICAL, command=self.log_text.yview)
         self.log_text.configure(yscrollcommand=log_scrollbar.set)
         
         self.log_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         log_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
+    def _on_tab_changed(self, event=None):
+        """Build deferred tabs the first time they're selected"""
+        index = self.notebook.index('current')
+        if index == 1 and not self._settings_built:
+            self._settings_built = True
+            self.setup_settings_tab()
+        elif index == 2 and not self._history_built:
+            self._history_built = True
+            self.setup_history_tab()
+            self.refresh_history()
+
     def setup_settings_tab(self):
         """Setup the settings tab"""
-        settings_frame = ttk.Frame(self.notebook)
-        self.notebook.add(settings_frame, text="Settings")
-        
+        settings_frame = self._settings_frame
+
         # Voice settings
         voice_frame = ttk.LabelFrame(settings_frame, text="Voice Settings", padding="10")
         voice_frame.pack(fill=tk.X, padx=10, pady=10)
@@ -136,16 +214,16 @@ class XizoEnhanced:
         ttk.Label(voice_frame, text="Wake Words:").pack(anchor=tk.W)
         self.wake_words_text = tk.Text(voice_frame, height=3, width=50)
         self.wake_words_text.pack(fill=tk.X, pady=(0, 10))
-        
+        # Populate from whatever the engine is currently using
+        self.wake_words_text.insert(1.0, '\n'.join(self.speech_engine.wake_words))
+
         # Voice feedback settings
-        self.voice_feedback_var = tk.BooleanVar(value=True)
-        ttk.Checkbutton(voice_frame, text="Enable Voice Feedback", 
+        ttk.Checkbutton(voice_frame, text="Enable Voice Feedback",
                        variable=self.voice_feedback_var).pack(anchor=tk.W)
-        
+
         # Speech rate
         ttk.Label(voice_frame, text="Speech Rate:").pack(anchor=tk.W, pady=(10, 0))
-        self.speech_rate_var = tk.IntVar(value=150)
-        rate_scale = ttk.Scale(voice_frame, from_=50, to=300, variable=self.speech_rate_var, 
+        rate_scale = ttk.Scale(voice_frame, from_=50, to=300, variable=self.speech_rate_var,
                               orient=tk.HORIZONTAL)
         rate_scale.pack(fill=tk.X, pady=(0, 10))
         
@@ -175,9 +253,8 @@ class XizoEnhanced:
         
     def setup_history_tab(self):
         """Setup the history tab"""
-        history_frame = ttk.Frame(self.notebook)
-        self.notebook.add(history_frame, text="History")
-        
+        history_frame = self._history_frame
+
         # History controls
         control_frame = ttk.Frame(history_frame)
         control_frame.pack(fill=tk.X, padx=10, pady=10)
@@ -207,24 +284,50 @@ class XizoEnhanced:
         self.history_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         history_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
+    def _ui(self, fn, *args):
+        """Run a widget mutation on the Tk main thread"""
+        self.root.after_idle(lambda: fn(*args))
+
     def _on_voice_command(self, text: str):
         """Handle voice command from speech engine"""
-        self.log_message(f"Voice command: {text}")
-        
+        # This runs on the speech-engine thread: widgets are only touched
+        # via _ui, which hops onto the Tk main loop
+        self._ui(self.log_message, f"Voice command: {text}")
+
         # Process command
         result = self.command_processor.process_command(text)
-        
+
         # Log result
         if result["success"]:
-            self.log_message(f"Result: {result['result']}")
-            self.voice_feedback.speak(f"Executed: {result['result']}")
+            self._ui(self.log_message, f"Result: {result['result']}")
+            self._speak_async(f"Executed: {result['result']}")
         else:
-            self.log_message(f"Error: {result['error']}")
-            self.voice_feedback.speak(f"Error: {result['error']}")
-        
-        # Update history
-        self.refresh_history()
+            self._ui(self.log_message, f"Error: {result['error']}")
+            self._speak_async(f"Error: {result['error']}")
+
+        # Append just the new row instead of rebuilding the whole view
+        self._ui(self._append_history_row, result)
     
+    def _speak_async(self, message: str):
+        """Queue a phrase, dropping the oldest pending one when backed up"""
+        try:
+            self._tts_q.put_nowait(message)
+        except queue.Full:
+            try:
+                self._tts_q.get_nowait()
+            except queue.Empty:
+                pass
+            self._tts_q.put_nowait(message)
+
+    def _speaker_loop(self):
+        """Feed queued phrases to the voice feedback engine"""
+        while self.is_running:
+            try:
+                message = self._tts_q.get(timeout=1)
+            except queue.Empty:
+                continue
+            self.voice_feedback.speak(message)
+
     def toggle_listening(self):
         """Toggle voice listening"""
         if self.speech_engine.is_listening:
@@ -258,48 +361,97 @@ class XizoEnhanced:
     
     def update_status(self):
         """Update status display"""
-        self.status_text.delete(1.0, tk.END)
-        
-        # Speech engine status
-        speech_status = self.speech_engine.get_available_backends()
-        self.status_text.insert(tk.END, "Speech Recognition:\n")
-        self.status_text.insert(tk.END, f"  Google: {'✓' if speech_status['google'] else '✗'}\n")
-        self.status_text.insert(tk.END, f"  Whisper: {'✓' if speech_status['whisper'] else '✗'}\n")
-        self.status_text.insert(tk.END, f"  Working: {'✓' if speech_status['working'] else '✗'}\n\n")
-        
-        # Voice feedback status
+        # Cached backend probe; only is_listening/is_speaking are truly
+        # per-tick values
+        now = time.monotonic()
+        if self._backends_cache[1] is None or now - self._backends_cache[0] > 10:
+            self._backends_cache = (now,
+                                    self.speech_engine.get_available_backends())
+        speech_status = self._backends_cache[1]
         feedback_status = self.voice_feedback.get_status()
-        self.status_text.insert(tk.END, "Voice Feedback:\n")
-        self.status_text.insert(tk.END, f"  Enabled: {'✓' if feedback_status['voice_enabled'] else '✗'}\n")
-        self.status_text.insert(tk.END, f"  PyTTSx3: {'✓' if feedback_status['pyttsx3_available'] else '✗'}\n")
-        self.status_text.insert(tk.END, f"  gTTS: {'✓' if feedback_status['gtts_available'] else '✗'}\n")
-        self.status_text.insert(tk.END, f"  Rate: {feedback_status['voice_rate']} WPM\n\n")
-        
-        # Listening status
-        self.status_text.insert(tk.END, f"Listening: {'✓' if self.speech_engine.is_listening else '✗'}\n")
-        self.status_text.insert(tk.END, f"Speaking: {'✓' if feedback_status['is_speaking'] else '✗'}\n")
+
+        # Skip the variables entirely when nothing changed since last tick
+        snapshot = (tuple(sorted(speech_status.items())),
+                    tuple(sorted(feedback_status.items())),
+                    self.speech_engine.is_listening)
+        if snapshot == self._last_status_snapshot:
+            return
+        self._last_status_snapshot = snapshot
+
+        def mark(flag):
+            return '✓' if flag else '✗'
+
+        values = {
+            'google': mark(speech_status['google']),
+            'whisper': mark(speech_status['whisper']),
+            'working': mark(speech_status['working']),
+            'enabled': mark(feedback_status['voice_enabled']),
+            'pyttsx3': mark(feedback_status['pyttsx3_available']),
+            'gtts': mark(feedback_status['gtts_available']),
+            'rate': f"{feedback_status['voice_rate']} WPM",
+            'listening': mark(self.speech_engine.is_listening),
+            'speaking': mark(feedback_status['is_speaking']),
+        }
+        for key, value in values.items():
+            self._status_vars[key].set(value)
     
     def log_message(self, message: str):
         """Add message to log with timestamp"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        log_entry = f"[{timestamp}] {message}\n"
-        self.log_text.insert(tk.END, log_entry)
+        now = time.time()
+        sec = int(now)
+        if sec != self._last_ts_sec:
+            self._last_ts_sec = sec
+            self._last_ts_str = time.strftime('%H:%M:%S', time.localtime(now))
+        self._log_buf.append(f"[{self._last_ts_str}] {message}\n")
+        if not self._log_flush_scheduled:
+            self._log_flush_scheduled = True
+            self.root.after_idle(self._flush_log)
+
+    def _flush_log(self):
+        """Render all buffered log lines with a single insert"""
+        self._log_flush_scheduled = False
+        if not self._log_buf:
+            return
+
+        batch = ''.join(self._log_buf)
+        self._log_buf.clear()
+
+        self.log_text.insert(tk.END, batch)
+        self._log_lines += batch.count('\n')
+        if self._log_lines > self._log_max:
+            self.log_text.delete('1.0', f'{self._log_lines - self._log_max + 1}.0')
+            self._log_lines = self._log_max
         self.log_text.see(tk.END)
-        print(log_entry.strip())
+        # One stdout write for the whole batch; print locks per call
+        sys.stdout.write(batch)
     
+    def _append_history_row(self, entry: dict):
+        """Insert one new history row at the top and trim the tail - O(1)"""
+        if not self._history_built:
+            return  # tab builds with a full refresh on first visit
+        timestamp = datetime.fromisoformat(entry['timestamp']).strftime('%H:%M:%S')
+        self.history_tree.insert('', 0, values=(timestamp, entry['command'], ''))
+        self._history_row_count += 1
+        if self._history_row_count > 50:
+            self.history_tree.delete(self.history_tree.get_children()[-1])
+            self._history_row_count = 50
+
     def refresh_history(self):
-        """Refresh command history display"""
-        # Clear existing items
-        for item in self.history_tree.get_children():
-            self.history_tree.delete(item)
-        
+        """Rebuild the history display (explicit Refresh button only)"""
+        # Clear all rows with a single Tcl call
+        kids = self.history_tree.get_children()
+        if kids:
+            self.history_tree.delete(*kids)
+
         # Get history
         history = self.command_processor.get_history(50)  # Last 50 commands
-        
-        # Add to treeview
-        for entry in reversed(history):  # Show newest first
-            timestamp = datetime.fromisoformat(entry['timestamp']).strftime('%H:%M:%S')
-            self.history_tree.insert('', 'end', values=(timestamp, entry['command'], ''))
+
+        # Format every row up front, then insert newest first
+        rows = [(datetime.fromisoformat(e['timestamp']).strftime('%H:%M:%S'),
+                 e['command'], '') for e in reversed(history)]
+        for row in rows:
+            self.history_tree.insert('', 'end', values=row)
+        self._history_row_count = len(rows)
     
     def clear_history(self):
         """Clear command history"""
@@ -323,15 +475,19 @@ class XizoEnhanced:
     def load_config(self):
         """Load configuration from file"""
         try:
-            if os.path.exists('config.json'):
-                with open('config.json', 'r') as f:
-                    config = json.load(f)
-                
-                # Load wake words
+            config = self._config_cache
+            if config is None and os.path.exists('config.json'):
+                with open('config.json', 'rb') as f:
+                    config = _loads(f.read())
+                self._config_cache = config
+
+            if config is not None:
+                # Load wake words (the Settings widget, if built, follows)
                 if 'wake_words' in config:
-                    self.speech_engine.wake_words = config['wake_words']
-                    self.wake_words_text.delete(1.0, tk.END)
-                    self.wake_words_text.insert(1.0, '\n'.join(config['wake_words']))
+                    self.speech_engine.set_wake_words(config['wake_words'])
+                    if self._settings_built:
+                        self.wake_words_text.delete(1.0, tk.END)
+                        self.wake_words_text.insert(1.0, '\n'.join(config['wake_words']))
                 
                 # Load voice feedback settings
                 if 'voice_feedback' in config:
@@ -357,24 +513,56 @@ class XizoEnhanced:
                 }
             }
             
-            with open('config.json', 'w') as f:
-                json.dump(config, f, indent=2)
-            
-            # Apply settings
-            self.speech_engine.wake_words = config['wake_words']
+            # Apply settings immediately; the disk write happens off-thread
+            self.speech_engine.set_wake_words(config['wake_words'])
             self.voice_feedback.voice_enabled = config['voice_feedback']['enabled']
             self.voice_feedback.set_voice_rate(config['voice_feedback']['rate'])
-            
-            self.log_message("Settings saved")
-            messagebox.showinfo("Success", "Settings saved successfully!")
-            
+            self._config_cache = config
+
+            threading.Thread(target=self._write_config, args=(config,),
+                             daemon=True).start()
+
         except Exception as e:
             self.log_message(f"Failed to save settings: {e}")
             messagebox.showerror("Error", f"Failed to save settings: {e}")
+
+    def _write_config(self, config: dict):
+        """Persist the config atomically, off the Tk main thread"""
+        try:
+            # Temp file + rename so a crash can't leave a torn config.json
+            with open('config.json.tmp', 'wb') as f:
+                f.write(_dumps(config))
+            os.replace('config.json.tmp', 'config.json')
+        except Exception as e:
+            self.root.after(0, lambda: (
+                self.log_message(f"Failed to save settings: {e}"),
+                messagebox.showerror("Error", f"Failed to save settings: {e}")))
+            return
+
+        self.root.after(0, lambda: (
+            self.log_message("Settings saved"),
+            messagebox.showinfo("Success", "Settings saved successfully!")))
     
+    def _tick_status(self):
+        """Periodic status refresh on the Tk main loop, no worker thread"""
+        delay = 2000
+        try:
+            if self.root.state() in ('iconic', 'withdrawn'):
+                # Nobody can see the window - do nothing and poll lazily
+                delay = 10000
+            elif self.notebook.index('current') == 0:
+                # Only recompute while the Main tab is actually visible
+                self.update_status()
+        except Exception as e:
+            logging.error(f"Status update failed: {e}")
+        if self.is_running:
+            self._status_after_id = self.root.after(delay, self._tick_status)
+
     def on_closing(self):
         """Handle application closing"""
         self.is_running = False
+        if self._status_after_id is not None:
+            self.root.after_cancel(self._status_after_id)
         self.speech_engine.cleanup()
         self.voice_feedback.cleanup()
         self.root.destroy()
@@ -384,21 +572,9 @@ class XizoEnhanced:
         self.log_message("Xizo Enhanced Voice Assistant started")
         self.log_message("Voice control module initialized")
         
-        # Initial status update
-        self.update_status()
-        
-        # Start status update thread
-        def status_updater():
-            while self.is_running:
-                try:
-                    self.root.after(0, self.update_status)
-                    threading.Event().wait(2)  # Update every 2 seconds
-                except:
-                    break
-        
-        status_thread = threading.Thread(target=status_updater, daemon=True)
-        status_thread.start()
-        
+        # Periodic status refresh, re-armed from the Tk main loop
+        self._tick_status()
+
         self.root.mainloop()
 
 if __name__ == "__main__":